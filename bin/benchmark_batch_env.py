@@ -0,0 +1,76 @@
+""" Benchmark of BatchTradingEnv step cost
+
+Compares one TradingEnv with precomputed observations, N TradingEnv objects stepped in a Python loop (what
+VectorizedEnv does in its worker processes) and BatchTradingEnv with N environments, reporting microseconds per
+step call and environment steps per second, for float64 and float32 observations.
+
+Usage:
+    python bin/benchmark_batch_env.py --num_envs 1 16 256 --steps 2000
+"""
+import time
+import argparse
+import numpy as np
+
+from finrock.data_feeder import NumpyDataFeeder
+from finrock.trading_env import TradingEnv, BatchTradingEnv
+from finrock.scalers import MinMaxScaler, ZScoreScaler
+from finrock.reward import AccountValueChangeReward
+from finrock.indicators import BolingerBands, RSI, PSAR
+from create_random_walk_data import create_random_walk_df
+
+
+def time_envs(envs: list, steps: int) -> float:
+    """ Seconds per step of all TradingEnv objects in Python loop
+    """
+    actions = np.random.default_rng(0).integers(0, 3, (steps, len(envs)))
+    for env in envs:
+        env.reset()
+
+    start = time.perf_counter()
+    for step_actions in actions:
+        for env, action in zip(envs, step_actions):
+            if env.step(int(action))[3]:
+                env.reset()
+    return (time.perf_counter() - start) / steps
+
+
+def time_batch_env(env: BatchTradingEnv, steps: int) -> float:
+    """ Seconds per step of all environments of BatchTradingEnv
+    """
+    actions = np.random.default_rng(0).integers(0, 3, (steps, env.num_envs))
+    env.reset()
+
+    start = time.perf_counter()
+    for step_actions in actions:
+        env.step(step_actions)
+    return (time.perf_counter() - start) / steps
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--num_envs', type=int, nargs='+', default=[1, 16, 256])
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--loop_steps', type=int, default=200, help='steps of N TradingEnv objects loop')
+    args = parser.parse_args()
+
+    df = create_random_walk_df(args.rows)
+
+    print(f"{'scaler':>13} {'dtype':>8} {'envs':>5} {'TradingEnv x1':>14} {'TradingEnv xN':>14} {'BatchTradingEnv':>16} {'batch env steps/s':>18}")
+    for dtype in [np.float64, np.float32]:
+        data_feeder = NumpyDataFeeder(df, indicators=[BolingerBands(data=df), RSI(data=df), PSAR(data=df)], dtype=dtype)
+        for scaler_class in [MinMaxScaler, ZScoreScaler]:
+            make_scaler = lambda: scaler_class(data_feeder.min, data_feeder.max, dtype=dtype) if scaler_class is MinMaxScaler else scaler_class(dtype=dtype)
+            make_env = lambda: TradingEnv(
+                data_feeder, make_scaler(), window_size=50, max_episode_steps=1000,
+                reward_function=AccountValueChangeReward(), precompute_observations=True
+            )
+            single = time_envs([make_env()], args.steps)
+            for num_envs in args.num_envs:
+                loop = time_envs([make_env() for _ in range(num_envs)], args.loop_steps)
+                batch_env = BatchTradingEnv(data_feeder, make_scaler(), num_envs=num_envs, window_size=50, max_episode_steps=1000)
+                batch = time_batch_env(batch_env, args.steps)
+                print(
+                    f"{scaler_class.__name__:>13} {np.dtype(dtype).name:>8} {num_envs:>5} {single * 1e6:>12.1f}us "
+                    f"{loop * 1e6:>12.1f}us {batch * 1e6:>14.1f}us {num_envs / batch:>18,.0f}"
+                )
@@ -0,0 +1,54 @@
+""" Throughput benchmark of indicators
+
+Computes every indicator over random walk OHLC prices and reports batch throughput (rows per second of compute over
+whole dataset) and online throughput (candles per second of OnlineIndicator.update, measured on at most
+--online_rows candles).
+
+Usage:
+    python bin/benchmark_indicators.py --sizes 100000 1000000 10000000
+"""
+import time
+import argparse
+import pandas as pd
+
+from finrock.indicators import SMA, EMA, BolingerBands, RSI, PSAR, MACD, ATR, ADX, Stochastic, CCI
+from create_random_walk_data import create_random_walk_df
+
+
+INDICATORS = [SMA, EMA, BolingerBands, RSI, PSAR, MACD, ATR, ADX, Stochastic, CCI]
+
+
+def batch_throughput(indicator_class, df: pd.DataFrame) -> float:
+    start = time.perf_counter()
+    indicator_class(data=df)
+    return len(df) / (time.perf_counter() - start)
+
+
+def online_throughput(indicator_class, df: pd.DataFrame) -> float:
+    candles = df.to_dict('records')
+    online = indicator_class(data=df.iloc[:100]).online()
+    start = time.perf_counter()
+    for candle in candles:
+        online.update(candle)
+    return len(candles) / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--online_rows', type=int, default=100_000, help='max candles to run online updates on')
+    args = parser.parse_args()
+
+    # compile numba kernels (or load them from cache) before timing
+    for indicator_class in INDICATORS:
+        indicator_class(data=create_random_walk_df(100, timestamps=False))
+
+    print(f"{'indicator':>14} {'rows':>10} {'batch rows/s':>14} {'online candles/s':>17}")
+    for size in args.sizes:
+        df = create_random_walk_df(size, timestamps=False)
+        online_df = df.iloc[:args.online_rows]
+        for indicator_class in INDICATORS:
+            print(
+                f"{indicator_class.__name__:>14} {size:>10} {batch_throughput(indicator_class, df):>14,.0f} "
+                f"{online_throughput(indicator_class, online_df):>17,.0f}"
+            )
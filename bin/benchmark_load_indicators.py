@@ -0,0 +1,57 @@
+""" Benchmark of load_indicators workers
+
+Computes the same indicator configs over random walk OHLC prices one after another (workers=1, the default) and in
+thread pools of --workers sizes, reporting seconds of the best of --repeats runs, speedup over serial computation and
+whether all computed columns are identical. Indicators computed serially and in threads share one FeatureStore.
+
+Usage:
+    python bin/benchmark_load_indicators.py --rows 1000000 --workers 2 4
+"""
+import os
+import time
+import argparse
+import numpy as np
+
+from finrock.data_feeder import load_indicators
+from create_random_walk_data import create_random_walk_df
+
+
+CONFIGS = [
+    {'name': 'SMA', 'period': 20}, {'name': 'SMA', 'period': 50},
+    {'name': 'EMA', 'period': 12}, {'name': 'EMA', 'period': 26},
+    {'name': 'BolingerBands', 'period': 20}, {'name': 'RSI', 'period': 14},
+    {'name': 'MACD'}, {'name': 'PSAR'}, {'name': 'ATR'}, {'name': 'ADX'},
+    {'name': 'Stochastic'}, {'name': 'CCI'},
+]
+
+
+def time_load(df, workers: int, repeats: int) -> tuple:
+    """ Best seconds of load_indicators and computed columns of the last run
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        indicators = load_indicators(CONFIGS, df, workers=workers)
+        times.append(time.perf_counter() - start)
+    return min(times), [indicator.to_numpy() for indicator in indicators]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    df = create_random_walk_df(args.rows, timestamps=False)
+    # compile numba kernels (or load them from cache) before timing
+    load_indicators(CONFIGS, df.iloc[:100])
+
+    print(f"{len(CONFIGS)} indicators over {args.rows} rows, {os.cpu_count()} cpus")
+    print(f"{'workers':>8} {'seconds':>8} {'speedup':>8}  identical")
+    serial, expected = time_load(df, 1, args.repeats)
+    print(f"{1:>8} {serial:>8.3f} {1.0:>7.2f}x  True")
+    for workers in args.workers:
+        seconds, values = time_load(df, workers, args.repeats)
+        identical = all(np.array_equal(a, b, equal_nan=True) for a, b in zip(expected, values))
+        print(f"{workers:>8} {seconds:>8.3f} {serial / seconds:>7.2f}x  {identical}")
@@ -0,0 +1,136 @@
+""" Benchmark of PSAR indicator computation
+
+Compares the original row by row pandas implementation (Series.iloc reads and writes) with the psar kernel,
+both with numba (when installed) and with its pure python fallback, and checks that all give identical output.
+The original implementation is timed on at most --reference_rows rows and extrapolated to the full size.
+
+Usage:
+    python bin/benchmark_psar.py --sizes 10000 1000000 10000000
+"""
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from finrock import indicators
+from finrock.indicators import PSAR
+from create_random_walk_data import create_random_walk_df
+
+
+def reference_psar(df: pd.DataFrame, step: float = 0.02, max_step: float = 0.2) -> np.ndarray:
+    """ Original row by row implementation of PSAR.compute
+    """
+    high = df['high']
+    low = df['low']
+    close = df['close']
+
+    up_trend = True
+    acceleration_factor = step
+    up_trend_high = high.iloc[0]
+    down_trend_low = low.iloc[0]
+
+    psar = close.copy()
+    for i in range(2, len(close)):
+        reversal = False
+
+        max_high = high.iloc[i]
+        min_low = low.iloc[i]
+
+        if up_trend:
+            psar.iloc[i] = psar.iloc[i - 1] + (acceleration_factor * (up_trend_high - psar.iloc[i - 1]))
+
+            if min_low < psar.iloc[i]:
+                reversal = True
+                psar.iloc[i] = up_trend_high
+                down_trend_low = min_low
+                acceleration_factor = step
+            else:
+                if max_high > up_trend_high:
+                    up_trend_high = max_high
+                    acceleration_factor = min(acceleration_factor + step, max_step)
+
+                low1 = low.iloc[i - 1]
+                low2 = low.iloc[i - 2]
+                if low2 < psar.iloc[i]:
+                    psar.iloc[i] = low2
+                elif low1 < psar.iloc[i]:
+                    psar.iloc[i] = low1
+        else:
+            psar.iloc[i] = psar.iloc[i - 1] - (acceleration_factor * (psar.iloc[i - 1] - down_trend_low))
+
+            if max_high > psar.iloc[i]:
+                reversal = True
+                psar.iloc[i] = down_trend_low
+                up_trend_high = max_high
+                acceleration_factor = step
+            else:
+                if min_low < down_trend_low:
+                    down_trend_low = min_low
+                    acceleration_factor = min(acceleration_factor + step, max_step)
+
+                high1 = high.iloc[i - 1]
+                high2 = high.iloc[i - 2]
+                if high2 > psar.iloc[i]:
+                    psar.iloc[i] = high2
+                elif high1 > psar.iloc[i]:
+                    psar.iloc[i] = high1
+
+        up_trend = up_trend != reversal  # XOR
+
+    return psar.to_numpy()
+
+
+def time_psar(df: pd.DataFrame, compiled: bool) -> tuple:
+    """ Time PSAR indicator construction with compiled or pure python kernel, returns seconds and psar values
+    """
+    numba_kernel = indicators._psar_compiled
+    if not compiled:
+        indicators._psar_compiled = None
+    try:
+        start = time.perf_counter()
+        psar = PSAR(data=df)
+        elapsed = time.perf_counter() - start
+    finally:
+        indicators._psar_compiled = numba_kernel
+
+    return elapsed, psar.to_numpy()[:, 0]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument('--reference_rows', type=int, default=20_000, help='max rows to run the original implementation on')
+    args = parser.parse_args()
+
+    has_numba = indicators._psar_compiled is not None
+    if has_numba:
+        # compile (or load from cache) before timing
+        time_psar(create_random_walk_df(10, timestamps=False), compiled=True)
+    else:
+        print('numba is not installed, only pure python kernel is benchmarked (pip install numba)')
+
+    print(f"{'rows':>10} {'original':>12} {'python':>10} {'numba':>10} {'python x':>9} {'numba x':>9}  identical")
+    for size in args.sizes:
+        df = create_random_walk_df(size, timestamps=False)
+
+        reference_df = df.iloc[:args.reference_rows]
+        start = time.perf_counter()
+        reference = reference_psar(reference_df)
+        # original implementation is linear in rows, its time is extrapolated beyond reference_rows
+        reference_time = (time.perf_counter() - start) * size / len(reference_df)
+
+        python_time, python_psar = time_psar(df, compiled=False)
+        identical = np.array_equal(python_psar[:len(reference)], reference)
+
+        numba_time = np.nan
+        if has_numba:
+            numba_time, numba_psar = time_psar(df, compiled=True)
+            identical = identical and np.array_equal(numba_psar, python_psar)
+
+        extrapolated = '*' if size > len(reference_df) else ' '
+        print(
+            f"{size:>10} {reference_time:>11.3f}s{extrapolated} {python_time:>9.3f}s {numba_time:>9.3f}s "
+            f"{reference_time / python_time:>8.1f}x {reference_time / numba_time:>8.1f}x  {identical}"
+        )
+
+    print(f"* extrapolated from the first {args.reference_rows} rows")
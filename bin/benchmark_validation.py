@@ -0,0 +1,128 @@
+""" Benchmark of TradingEnv validation modes
+
+Runs the same episodes with validation='strict' (per-step checks of states, observations and allocation) and
+validation='fast' (dataset validated once with data_feeder.validate()) and reports steps per second of both,
+time of one-off dataset validation and whether both modes return identical observations and rewards. Each mode
+is run --repeats times, alternating with the other one, and the best run is reported.
+
+Per-step checks are a small part of a whole step, so cost of each check is also reported separately: the method of
+TradingEnv.step that runs the check (_take_action, _transform_observations, reward function and metrics calls with
+environment's validation arguments) is called --calls times by 'strict' and 'fast' environment in the same state and
+the difference per call is shown in microseconds and as share of strict step time.
+
+Usage:
+    python bin/benchmark_validation.py --rows 100000 --steps 20000
+"""
+import time
+import timeit
+import argparse
+import numpy as np
+
+from finrock.data_feeder import NumpyDataFeeder
+from finrock.trading_env import TradingEnv, Validation
+from finrock.scalers import MinMaxScaler, ZScoreScaler
+from finrock.reward import SimpleReward
+from finrock.metrics import DifferentActions, AccountValue, MaxDrawdown
+from finrock.indicators import BolingerBands, RSI, PSAR
+from create_random_walk_data import create_random_walk_df
+
+
+def run(data_feeder, scaler, validation: Validation, precompute: bool, steps: int) -> tuple:
+    """ Steps per second of environment, sum of observations and rewards
+    """
+    env = TradingEnv(
+        data_feeder, scaler, window_size=50, max_episode_steps=1000, reward_function=SimpleReward(),
+        metrics=[DifferentActions(), AccountValue(), MaxDrawdown()], precompute_observations=precompute,
+        validation=validation
+    )
+    np.random.seed(0)
+    obs, _ = env.reset()
+    actions = np.random.default_rng(0).integers(0, 3, steps)
+    total_obs, total_reward = 0.0, 0.0
+
+    start = time.perf_counter()
+    for action in actions:
+        obs, reward, terminated, truncated, _ = env.step(int(action))
+        total_obs += obs[-1, 0]
+        total_reward += reward
+        if terminated or truncated:
+            obs, _ = env.reset()
+    elapsed = time.perf_counter() - start
+
+    return steps / elapsed, total_obs, total_reward
+
+
+def time_call(function, calls: int, repeats: int = 5) -> float:
+    """ Best seconds per call of function
+    """
+    return min(timeit.repeat(function, number=calls, repeat=repeats)) / calls
+
+
+def time_checks(data_feeder, scaler_class, calls: int) -> dict:
+    """ Microseconds per step of each checked part of TradingEnv.step, as difference of the same environment method 
+    called by 'strict' and 'fast' environment in the same state
+    """
+    envs = {}
+    for validation in [Validation.STRICT, Validation.FAST]:
+        scaler = scaler_class(data_feeder.min, data_feeder.max) if scaler_class is MinMaxScaler else scaler_class()
+        env = TradingEnv(
+            data_feeder, scaler, window_size=50, max_episode_steps=1000, reward_function=SimpleReward(),
+            metrics=[DifferentActions(), AccountValue(), MaxDrawdown()], precompute_observations=True, validation=validation
+        )
+        np.random.seed(0)
+        env.reset()
+        env.step(2)
+        envs[validation] = env
+
+    def cost(call) -> float:
+        return time_call(lambda: call(envs[Validation.STRICT]), calls) - time_call(lambda: call(envs[Validation.FAST]), calls)
+
+    costs = {
+        'state type (Observations.append)': cost(lambda env: env._observations.append(env._observations[-1])),
+        'observations type (reward)': cost(lambda env: env._reward_function(env._observations, **env._reward_kwargs)),
+        'state type (metrics)': cost(lambda env: env._metricsHandler(env._observations[-1])),
+        'allocation range (_take_action)': cost(lambda env: env._take_action(2)),
+        'nan in observation (_transform_observations)': cost(lambda env: env._transform_observations(env._env_step_indexes[0] - 1)),
+    }
+    return {name: max(value, 0.0) * 1e6 for name, value in costs.items()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--steps', type=int, default=20_000)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--calls', type=int, default=20_000, help='calls per timing of each check')
+    args = parser.parse_args()
+
+    df = create_random_walk_df(args.rows)
+    data_feeder = NumpyDataFeeder(df, indicators=[BolingerBands(data=df), RSI(data=df), PSAR(data=df)])
+
+    start = time.perf_counter()
+    data_feeder.validate()
+    print(f"dataset validation of {args.rows} rows: {time.perf_counter() - start:.4f}s (once per data feeder)")
+
+    print(f"{'scaler':>14} {'precompute':>10} {'strict steps/s':>15} {'fast steps/s':>13} {'speedup':>8}  identical")
+    strict_steps = {}
+    for scaler_class in [MinMaxScaler, ZScoreScaler]:
+        for precompute in [False, True]:
+            make_scaler = lambda: scaler_class(data_feeder.min, data_feeder.max) if scaler_class is MinMaxScaler else scaler_class()
+            runs = {Validation.STRICT: [], Validation.FAST: []}
+            for _ in range(args.repeats):
+                for validation, results in runs.items():
+                    results.append(run(data_feeder, make_scaler(), validation, precompute, args.steps))
+            strict, fast = max(runs[Validation.STRICT]), max(runs[Validation.FAST])
+            strict_steps[scaler_class, precompute] = strict[0]
+            print(
+                f"{scaler_class.__name__:>14} {str(precompute):>10} {strict[0]:>15,.0f} {fast[0]:>13,.0f} "
+                f"{fast[0] / strict[0]:>7.2f}x  {strict[1:] == fast[1:]}"
+            )
+
+    # the cheapest step (precomputed observations) is where checks take the largest share
+    for scaler_class in [MinMaxScaler, ZScoreScaler]:
+        step_us = 1e6 / strict_steps[scaler_class, True]
+        costs = time_checks(data_feeder, scaler_class, args.calls)
+        print(f"\nper-step checks, {scaler_class.__name__} with precomputed observations ({step_us:.1f}us per strict step)")
+        print(f"{'check':>44} {'us/step':>8} {'share':>7}")
+        for name, cost in [*costs.items(), ('total', sum(costs.values()))]:
+            print(f"{name:>44} {cost:>8.2f} {cost / step_us:>7.1%}")
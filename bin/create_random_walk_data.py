@@ -0,0 +1,31 @@
+import os
+import numpy as np
+import pandas as pd
+
+def create_random_walk_df(
+    num_samples = 10000, # Number of data samples
+    seed = 0, # Seed of random generator, the same seed gives the same prices
+    timestamps = True, # Add column of 1 hour timestamps
+    ):
+    """Create a dataframe with random walk OHLC prices, long enough series take both trends and many reversals"""
+    rng = np.random.default_rng(seed)
+    close = 20000 + np.cumsum(rng.normal(0, 50, num_samples))
+    open = np.concatenate([close[:1], close[:-1]])
+    high = np.maximum(open, close) + rng.uniform(0, 30, num_samples)
+    low = np.minimum(open, close) - rng.uniform(0, 30, num_samples)
+
+    df = pd.DataFrame({'open': open, 'high': high, 'low': low, 'close': close})
+    if timestamps:
+        df.insert(0, 'timestamp', pd.date_range('2020-01-01', periods=num_samples, freq='h').strftime('%Y-%m-%d %H:%M:%S'))
+
+    return df
+
+if __name__ == '__main__':
+    # Create a dataframe with random walk data
+    df = create_random_walk_df()
+
+    # Create a directory to store the datasets
+    os.makedirs('Datasets', exist_ok=True)
+
+    # Save the dataframe to a CSV file
+    df.to_csv(f'Datasets/random_walk.csv')
@@ -6,19 +6,22 @@ from finrock.trading_env import TradingEnv
 from finrock.render import PygameRender
 from finrock.scalers import ZScoreScaler
 from finrock.reward import AccountValueChangeReward
-from finrock.indicators import BolingerBands, SMA, RSI, PSAR, MACD
+from finrock.indicators import BolingerBands, SMA, RSI, PSAR, MACD, FeatureStore
 from finrock.metrics import DifferentActions, AccountValue, MaxDrawdown, SharpeRatio
 
 df = pd.read_csv('Datasets/random_sinusoid.csv')
 
+# indicators read columns and shared intermediates from one store instead of copying df
+store = FeatureStore(df)
+
 pd_data_feeder = PdDataFeeder(
     df = df,
     indicators = [
-        BolingerBands(data=df, period=20, std=2),
-        RSI(data=df, period=14),
-        PSAR(data=df),
-        MACD(data=df),
-        SMA(data=df, period=7),
+        BolingerBands(data=store, period=20, std=2),
+        RSI(data=store, period=14),
+        PSAR(data=store),
+        MACD(data=store),
+        SMA(data=store, period=7),
     ]
 )
 
@@ -7,12 +7,12 @@ for gpu in tf.config.experimental.list_physical_devices('GPU'):
 
 from keras import layers, models
 
-from finrock.data_feeder import PdDataFeeder
+from finrock.data_feeder import SharedMemoryDataFeeder
 from finrock.trading_env import TradingEnv, ActionSpace
 from finrock.scalers import ZScoreScaler
 from finrock.reward import AccountValueChangeReward
 from finrock.metrics import DifferentActions, AccountValue, MaxDrawdown, SharpeRatio
-from finrock.indicators import BolingerBands, RSI, PSAR, SMA, MACD
+from finrock.indicators import BolingerBands, RSI, PSAR, SMA, MACD, FeatureStore
 
 from rockrl.utils.misc import MeanAverage
 from rockrl.utils.memory import MemoryManager
@@ -22,15 +22,19 @@ from rockrl.utils.vectorizedEnv import VectorizedEnv
 df = pd.read_csv('Datasets/random_sinusoid.csv')
 df = df[:-1000] # leave 1000 for testing
 
-pd_data_feeder = PdDataFeeder(
+# indicators read columns and shared intermediates from one store instead of copying df
+store = FeatureStore(df)
+
+pd_data_feeder = SharedMemoryDataFeeder(
     df,
     indicators = [
-        BolingerBands(data=df, period=20, std=2),
-        RSI(data=df, period=14),
-        PSAR(data=df),
-        MACD(data=df),
-        SMA(data=df, period=7),
-    ]
+        BolingerBands(data=store, period=20, std=2),
+        RSI(data=store, period=14),
+        PSAR(data=store),
+        MACD(data=store),
+        SMA(data=store, period=7),
+    ],
+    dtype = np.float32,
 )
 
 num_envs = 10
@@ -38,7 +42,7 @@ env = VectorizedEnv(
     env_object = TradingEnv,
     num_envs = num_envs,
     data_feeder = pd_data_feeder,
-    output_transformer = ZScoreScaler(),
+    output_transformer = ZScoreScaler(dtype=np.float32),
     initial_balance = 1000.0,
     max_episode_steps = 1000,
     window_size = 50,
@@ -125,4 +129,5 @@ while True:
         break
 
 env.close()
+pd_data_feeder.close()
 exit()
\ No newline at end of file
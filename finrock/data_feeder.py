@@ -1,24 +1,285 @@
+import io
 import os
+import sys
+import copy
 import json
+import typing
 import importlib
+import threading
+import itertools
+from enum import Enum
+from datetime import datetime
+from functools import reduce
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
 import pandas as pd
-from finrock.state import State
-from finrock.indicators import Indicator
+from finrock.state import State, StateBatch, indicator_bounds
+from finrock.indicators import Indicator, PanelFrame, FeatureStore
+
+
+def load_indicator(config: dict, data: typing.Union[pd.DataFrame, FeatureStore]=None) -> Indicator:
+    """ Create Indicator object from its config, data=None skips computation (columns are precomputed)
+    """
+    indicator_class = getattr(importlib.import_module(".indicators", package=__package__), config["name"])
+    return indicator_class(data=data, **config)
+
+
+def load_indicators(
+        configs: list, 
+        data: typing.Union[pd.DataFrame, PanelFrame, FeatureStore], 
+        workers: int=1
+    ) -> typing.List[Indicator]:
+    """ Create and compute Indicator objects from their configs, returned in order of configs
+
+    workers=1 (default) computes indicators one after another on one FeatureStore, so shared intermediates are 
+    computed once. Otherwise they are computed in pool of workers threads on the same store. Pandas indicator 
+    operations mostly hold the GIL, so workers > 1 gives no speedup (bin/benchmark_load_indicators.py).
+    """
+    store = FeatureStore(data)
+    if workers is None or workers <= 1 or len(configs) <= 1:
+        return [load_indicator(config, data=store) for config in configs]
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(configs))) as pool:
+        return list(pool.map(lambda config: load_indicator(config, data=store), configs))
+
+
+def _indicator_slices(indicators: list) -> typing.List[slice]:
+    """ Slice of columns of each indicator in matrix of all indicator columns, in order of indicators
+    """
+    slices, start = [], 0
+    for indicator in indicators:
+        slices.append(slice(start, start + len(indicator.names)))
+        start += len(indicator.names)
+
+    return slices
+
+
+def parse_timestamps(timestamps, format: str=None, unit: str='s') -> np.ndarray:
+    """ Parse whole timestamp column at once into int64 seconds since epoch
+
+    Strings are parsed with pandas (format=None infers it, e.g. ISO 8601), numeric columns are treated as 
+    epoch values in given unit ('s', 'ms', 'us', 'ns'). Timezone aware timestamps are converted to UTC.
+    """
+    timestamps = pd.Series(timestamps)
+    if pd.api.types.is_numeric_dtype(timestamps):
+        dates = pd.to_datetime(timestamps, unit=unit)
+    else:
+        dates = pd.to_datetime(timestamps, format=format)
+
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_convert("UTC").dt.tz_localize(None)
+
+    return dates.to_numpy(dtype="datetime64[s]").astype(np.int64)
+
+
+def parse_timestamp(timestamp, format: str=None, unit: str='s') -> int:
+    """ Parse single timestamp into int64 seconds since epoch, same as parse_timestamps without per call Series overhead
+    """
+    if isinstance(timestamp, str):
+        date = pd.Timestamp(datetime.strptime(timestamp, format) if format else timestamp)
+    else:
+        date = pd.Timestamp(timestamp, unit=unit)
+
+    if date.tzinfo is not None:
+        date = date.tz_convert("UTC").tz_localize(None)
+
+    return int(np.datetime64(date, "s").astype(np.int64))
+
+
+def validate_arrays(ohlcv: np.ndarray, epoch: np.ndarray, valid: np.ndarray, offset: int = 0) -> None:
+    """ Validate dataset arrays at once, so environments can skip per-step checks of every observation
+
+    Raises ValueError when rows after the first valid row have indicators not computed (they would be served as 
+    None in the middle of an episode), open, high, low or close of these rows is nan or not positive, low is above 
+    or high is below open and close, or timestamps are not strictly increasing. ohlcv has shape (len, 5) or 
+    (len, assets, 5) with valid rows mask of shape (len,), offset is index of first row reported in errors.
+    """
+    def rows(mask: np.ndarray, start: int) -> list:
+        """ First ten rows where mask is set for any asset
+        """
+        return (np.flatnonzero(mask.reshape(len(mask), -1).any(axis=1))[:10] + offset + start).tolist()
+
+    valid = np.asarray(valid, dtype=bool)
+    if not valid.any():
+        raise ValueError("dataset has no row with all indicators computed")
+
+    first = int(np.argmax(valid))
+    if not valid[first:].all():
+        raise ValueError(f"indicators are not computed (nan) after first valid row {first + offset}, at rows: {rows(~valid[first:], first)}")
+
+    ohlc = np.asarray(ohlcv[first:])[..., :4]
+    if np.isnan(ohlc).any():
+        raise ValueError(f"open, high, low or close is nan at rows: {rows(np.isnan(ohlc), first)}")
+
+    if (ohlc <= 0).any():
+        raise ValueError(f"open, high, low and close must be > 0, received values <= 0 at rows: {rows(ohlc <= 0, first)}")
+
+    open, high, low, close = np.moveaxis(ohlc, -1, 0)
+    inconsistent = (low > np.minimum(open, close)) | (high < np.maximum(open, close))
+    if inconsistent.any():
+        raise ValueError(f"low must be <= open, close <= high, received inconsistent prices at rows: {rows(inconsistent, first)}")
+
+    not_increasing = np.diff(np.asarray(epoch)) <= 0
+    if not_increasing.any():
+        raise ValueError(f"timestamps must be strictly increasing, received duplicated or earlier timestamps at rows: {rows(not_increasing, 1)}")
+
+
+def approximate_sizeof(obj, seen: set=None) -> int:
+    """ Approximate memory footprint of object in bytes, following containers and object attributes
+    """
+    seen = set() if seen is None else seen
+    # enum members, classes and batches of feeder arrays are shared, not owned by the object
+    if id(obj) in seen or isinstance(obj, (Enum, type, StateBatch, PdDataFeeder)):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approximate_sizeof(key, seen) + approximate_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(approximate_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += approximate_sizeof(obj.__dict__, seen)
+    elif hasattr(obj, "__slots__"):
+        size += sum(approximate_sizeof(getattr(obj, name, None), seen) for name in obj.__slots__)
+
+    return size
+
+
+class StateCache:
+    """ Bounded LRU cache for states served by data feeders
+
+    max_size limits number of cached rows and max_bytes limits their approximate memory footprint, when limit 
+    is reached least recently used rows are evicted. None means no limit (every touched row stays cached) 
+    and max_size=0 disables caching. Hits, misses, evictions and bytes are counted to size cache on a machine.
+
+    All states of a feeder share the same layout, so footprint is measured once on the first cached state 
+    and reused as per row estimate instead of walking every state. Lookups, inserts and evictions hold a lock, 
+    so one feeder can be shared by environments stepping in multiple threads.
+    """
+    _missing = object()
+
+    def __init__(self, max_size: int=None, max_bytes: int=None) -> None:
+        self._max_size = max_size
+        self._max_bytes = max_bytes
+        self._states = OrderedDict()
+        self._sizes = {}
+        self._state_size = None
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+        assert max_size is None or max_size >= 0, f"max_size must be None or >= 0, received: {max_size}"
+        assert max_bytes is None or max_bytes >= 0, f"max_bytes must be None or >= 0, received: {max_bytes}"
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, idx: int) -> bool:
+        return idx in self._states
+
+    def get(self, idx: int, default=None):
+        """ Return cached state and mark it as recently used, default if idx is not cached
+        """
+        with self._lock:
+            state = self._states.get(idx, self._missing)
+            if state is self._missing:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._states.move_to_end(idx)
+            return state
+
+    def __setitem__(self, idx: int, state: State) -> None:
+        if self._max_size == 0:
+            return
+
+        with self._lock:
+            self._set(idx, state)
+
+    def _set(self, idx: int, state: State) -> None:
+        if idx in self._states:
+            self.bytes -= self._sizes[idx]
+
+        self._states[idx] = state
+        self._states.move_to_end(idx)
+        if state is None:
+            self._sizes[idx] = sys.getsizeof(state)
+        else:
+            self._state_size = self._state_size or approximate_sizeof(state)
+            self._sizes[idx] = self._state_size
+        self.bytes += self._sizes[idx]
+
+        while self._states and (
+            (self._max_size is not None and len(self._states) > self._max_size) or 
+            (self._max_bytes is not None and self.bytes > self._max_bytes)
+            ):
+            evicted_idx, _ = self._states.popitem(last=False)
+            self.bytes -= self._sizes.pop(evicted_idx)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self._sizes.clear()
+            self.bytes = 0
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = sum(self._sizes.values())
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self.bytes,
+            "hit_rate": self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0
+        }
 
 
 class PdDataFeeder:
+    _validated = False
+    _batch = None
+
     def __init__(
             self, 
             df: pd.DataFrame,
             indicators: list = [],
             min: float = None,
             max: float = None,
+            cache_size: int = None,
+            cache_bytes: int = None,
+            timestamp_format: str = None,
+            timestamp_unit: str = 's',
             ) -> None:
         self._df = df
         self._min = min
         self._max = max
         self._indicators = indicators
-        self._cache = {}
+        self._cache = StateCache(max_size=cache_size, max_bytes=cache_bytes)
 
         assert isinstance(self._df, pd.DataFrame) == True, "df must be a pandas.DataFrame"
         assert 'timestamp' in self._df.columns, "df must have 'timestamp' column"
@@ -30,6 +291,10 @@ class PdDataFeeder:
         assert isinstance(self._indicators, list) == True, "indicators must be an iterable"
         assert all(isinstance(indicator, Indicator) for indicator in self._indicators) == True, "indicators must be a list of Indicator objects"
 
+        self._timestamp_format = timestamp_format
+        self._timestamp_unit = timestamp_unit
+        self._epoch = parse_timestamps(self._df['timestamp'], format=timestamp_format, unit=timestamp_unit)
+
     @property
     def __name__(self) -> str:
         return self.__class__.__name__
@@ -38,6 +303,14 @@ class PdDataFeeder:
     def name(self) -> str:
         return self.__name__
 
+    @property
+    def cache(self) -> StateCache:
+        return self._cache
+
+    @property
+    def indicators(self) -> list:
+        return self._indicators
+
     @property
     def min(self) -> float:
         return self._min or self._df['low'].min()
@@ -51,31 +324,58 @@ class PdDataFeeder:
     
     def __getitem__(self, idx: int, args=None) -> State:
         # Use cache to speed up training
-        if idx in self._cache:
-            return self._cache[idx]
+        state = self._cache.get(idx, StateCache._missing)
+        if state is not StateCache._missing:
+            return state
 
-        indicators = []
-        for indicator in self._indicators:
-            results = indicator(idx)
-            if results is None:
-                self._cache[idx] = None
-                return None
-            
-            indicators.append(results)
-
-        data = self._df.iloc[idx]
-        state = State(
-            timestamp=data['timestamp'],
-            open=data['open'],
-            high=data['high'],
-            low=data['low'],
-            close=data['close'],
-            volume=data.get('volume', 0.0),
-            indicators=indicators
-        )
+        state = self._rows().state(idx)
         self._cache[idx] = state
 
         return state
+
+    def _rows(self) -> StateBatch:
+        """ StateBatch over columns of df and indicators, converted to arrays on first access, so rows are served by 
+        array indexing instead of per-row DataFrame.iloc and Indicator.values_at lookups
+        """
+        if self._batch is None:
+            volume = self._df['volume'] if 'volume' in self._df.columns else np.zeros(len(self._df))
+            ohlcv = np.column_stack([self._df['open'], self._df['high'], self._df['low'], self._df['close'], volume]).astype(np.float64)
+            if self._indicators:
+                indicator_values = np.column_stack([indicator.to_numpy() for indicator in self._indicators]).astype(np.float64)
+            else:
+                indicator_values = np.empty((len(self._df), 0))
+
+            self._batch = StateBatch(
+                self._df['timestamp'].to_numpy(), self._epoch, ohlcv, indicator_values, 
+                ~np.isnan(indicator_values).any(axis=1), self._indicators, _indicator_slices(self._indicators)
+            )
+
+        return self._batch
+
+    @property
+    def indicator_bounds(self) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """ Min and max of indicator of each value in state indicator_values
+        """
+        return indicator_bounds(self._indicators)
+
+    def _validation_arrays(self) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """ ohlcv, epoch and valid rows mask of whole dataset, as checked by validate_arrays
+        """
+        rows = self._rows()
+        return rows.ohlcv, self._epoch, rows.valid
+
+    def validate(self) -> None:
+        """ Validate whole dataset once (see validate_arrays), so TradingEnv in 'fast' validation mode can skip 
+        per-step checks, repeated calls return immediately
+        """
+        if not self._validated:
+            validate_arrays(*self._validation_arrays())
+            self._validated = True
+
+    def serialised_indicators(self, idx: int) -> list:
+        """ Serialised indicators (with render options) of row at idx
+        """
+        return self._rows().serialised_indicators(idx)
     
     def __iter__(self) -> State:
         """ Create a generator that iterate over the Sequence."""
@@ -95,8 +395,8 @@ class PdDataFeeder:
         with open(os.path.join(path, "PdDataFeeder.json"), 'w') as outfile:
             json.dump(config, outfile, indent=4)
 
-    @staticmethod
-    def load_config(df, path: str) -> None:
+    @classmethod
+    def load_config(cls, df, path: str, cache_dir: str = None, workers: int = 1, **kwargs) -> None:
         # load config from json file
         config_path = os.path.join(path, "PdDataFeeder.json")
         if not os.path.exists(config_path):
@@ -105,12 +405,740 @@ class PdDataFeeder:
         with open(config_path) as json_file:
             config = json.load(json_file)
 
-        _indicators = []
-        for indicator in config["indicators"]:
-            indicator_class = getattr(importlib.import_module(".indicators", package=__package__), indicator["name"])
-            ind = indicator_class(data=df, **indicator)
-            _indicators.append(ind)
+        # indicators share one store of input columns and intermediates, cache_dir reuses indicator columns 
+        # computed on the same data in previous runs, workers are passed to load_indicators
+        store = FeatureStore(df)
+        _indicators = load_indicators(
+            [{**indicator, "cache_dir": cache_dir} for indicator in config["indicators"]], store, workers=workers
+        )
+        store.clear()
+
+        pdDataFeeder = cls(df=df, indicators=_indicators, min=config["min"], max=config["max"], **kwargs)
+
+        return pdDataFeeder
+
+
+class NumpyDataFeeder(PdDataFeeder):
+    """ Array-backed data feeder
+
+    OHLCV and all indicator columns are converted once at construction into contiguous numpy arrays, so each 
+    row is served by plain array indexing instead of per-step DataFrame.iloc lookups. Interface is the same 
+    as PdDataFeeder and it returns the same State objects.
+
+    dtype of arrays can be set to np.float32 to halve memory of dataset, when scalers produce float32 observations.
+    """
+    # reason why subclass can't append candles, None when append is supported
+    _append_unsupported = None
+
+    def __init__(
+            self, 
+            df: pd.DataFrame,
+            indicators: list = [],
+            min: float = None,
+            max: float = None,
+            cache_size: int = None,
+            cache_bytes: int = None,
+            timestamp_format: str = None,
+            timestamp_unit: str = 's',
+            dtype: np.dtype = np.float64,
+            ) -> None:
+        super().__init__(
+            df=df, indicators=indicators, min=min, max=max, cache_size=cache_size, cache_bytes=cache_bytes, 
+            timestamp_format=timestamp_format, timestamp_unit=timestamp_unit
+        )
+
+        volume = df['volume'] if 'volume' in df.columns else np.zeros(len(df))
+        ohlcv = np.column_stack([df['open'], df['high'], df['low'], df['close'], volume])
+
+        # all indicator columns in one matrix, each indicator owns a slice of columns
+        if self._indicators:
+            indicator_values = np.column_stack([indicator.to_numpy() for indicator in self._indicators])
+        else:
+            indicator_values = np.empty((len(df), 0))
+
+        self._init_arrays(
+            timestamp=df['timestamp'].to_numpy(),
+            epoch=self._epoch,
+            ohlcv=np.ascontiguousarray(ohlcv, dtype=dtype),
+            indicator_values=np.ascontiguousarray(indicator_values, dtype=dtype),
+            # rows where any indicator is not yet computed (nan) are served as None
+            valid=~np.isnan(indicator_values).any(axis=1)
+        )
+
+    def _init_arrays(
+            self,
+            timestamp: np.ndarray,
+            epoch: np.ndarray,
+            ohlcv: np.ndarray,
+            indicator_values: np.ndarray,
+            valid: np.ndarray
+        ) -> None:
+        self._timestamp = timestamp
+        self._epoch = epoch
+        self._ohlcv = ohlcv
+        self._indicator_values = indicator_values
+        self._valid = valid
+        self._buffers = None # growable copies of arrays, created by first append
+
+        self._indicator_slices = _indicator_slices(self._indicators)
+        assert self._indicator_values.shape[-1] == sum(len(indicator.names) for indicator in self._indicators), \
+            "indicator_values must have a column for each indicator name"
+
+        self._batch = StateBatch(timestamp, epoch, ohlcv, indicator_values, valid, self._indicators, self._indicator_slices)
+
+    @property
+    def ohlcv(self) -> np.ndarray:
+        """ Array of shape (len, 5) with open, high, low, close and volume columns
+        """
+        return self._ohlcv
+
+    @property
+    def indicator_values(self) -> np.ndarray:
+        """ Array of shape (len, indicator names) with columns of all indicators in order of indicators list
+        """
+        return self._indicator_values
+
+    @property
+    def valid(self) -> np.ndarray:
+        """ Mask of rows, that have all indicators computed (other rows are served as None)
+        """
+        return self._valid
+
+    @property
+    def indicator_slices(self) -> list:
+        return self._indicator_slices
+
+    @property
+    def batch(self) -> StateBatch:
+        """ StateBatch view over arrays, States of rows are compact proxies that read indicators from arrays on access
+        """
+        return self._batch
+
+    @property
+    def min(self) -> float:
+        return self._min or self._ohlcv[..., 2].min()
+    
+    @property
+    def max(self) -> float:
+        return self._max or self._ohlcv[..., 1].max()
+
+    def __len__(self) -> int:
+        return len(self._ohlcv)
+
+    def __getitem__(self, idx: int, args=None) -> State:
+        # Use cache to speed up training
+        state = self._cache.get(idx, StateCache._missing)
+        if state is not StateCache._missing:
+            return state
+
+        state = self._state(idx)
+        self._cache[idx] = state
+
+        return state
+
+    def _state(self, row: int) -> State:
+        """ Create State from row of precomputed arrays, None if indicators are not computed for this row
+        """
+        return self._batch.state(row)
+
+    def _validation_arrays(self) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._ohlcv, self._epoch, self._valid
+
+    def append(self, candle: dict) -> State:
+        """ Append new candle (dict with timestamp, open, high, low, close and optional volume) after the last row 
+        and return its State
+
+        Indicators are updated incrementally from their carried state and arrays grow by doubling their capacity, 
+        so latency per candle doesn't depend on length of history. Observations precomputed by scalers don't 
+        include appended rows.
+        """
+        if self._append_unsupported:
+            raise TypeError(f"{self.__class__.__name__} {self._append_unsupported}, append candles to NumpyDataFeeder")
+
+        if self._buffers is None:
+            # indicators continue from the last rows of arrays, buffers start as the arrays themselves
+            history = pd.DataFrame(self._ohlcv, columns=['open', 'high', 'low', 'close', 'volume'], copy=False)
+            self._online_indicators = [indicator.online(history) for indicator in self._indicators]
+            self._buffers = {
+                "epoch": self._epoch,
+                "ohlcv": self._ohlcv,
+                "indicators": self._indicator_values,
+                "valid": self._valid
+            }
+            # feeders opened from saved or shared arrays have no timestamp strings, they are formatted from epoch
+            if self._timestamp is not None:
+                self._buffers["timestamp"] = np.asarray(self._timestamp, dtype=object)
+
+        idx = len(self)
+        if idx == len(self._buffers["ohlcv"]):
+            capacity = max(2 * idx, 1024)
+            for name, buffer in self._buffers.items():
+                grown = np.empty((capacity,) + buffer.shape[1:], dtype=buffer.dtype)
+                grown[:idx] = buffer[:idx]
+                self._buffers[name] = grown
+
+        values = [value for indicator in self._online_indicators for value in indicator.update(candle)]
+
+        if "timestamp" in self._buffers:
+            self._buffers["timestamp"][idx] = candle["timestamp"]
+        self._buffers["epoch"][idx] = parse_timestamp(candle["timestamp"], format=self._timestamp_format, unit=self._timestamp_unit)
+        self._buffers["ohlcv"][idx] = [candle["open"], candle["high"], candle["low"], candle["close"], candle.get("volume", 0.0)]
+        self._buffers["indicators"][idx] = values
+        self._buffers["valid"][idx] = not np.isnan(values).any()
+
+        self._timestamp = self._buffers["timestamp"][:idx + 1] if "timestamp" in self._buffers else None
+        self._epoch = self._buffers["epoch"][:idx + 1]
+        self._ohlcv = self._buffers["ohlcv"][:idx + 1]
+        self._indicator_values = self._buffers["indicators"][:idx + 1]
+        self._valid = self._buffers["valid"][:idx + 1]
+        self._batch = StateBatch(
+            self._timestamp, self._epoch, self._ohlcv, self._indicator_values, self._valid, self._indicators, self._indicator_slices
+        )
+        if self._validated:
+            # validated dataset stays valid, appended candle is checked against the previous row
+            validate_arrays(*(array[max(idx - 1, 0):] for array in self._validation_arrays()), offset=max(idx - 1, 0))
+
+        return self[idx]
+
+    def _arrays(self) -> dict:
+        """ Precomputed arrays by name, timestamps are kept only as epoch seconds and formatted from them on read
+        """
+        return {
+            "epoch": self._epoch,
+            "ohlcv": self._ohlcv,
+            "indicators": self._indicator_values,
+            "valid": self._valid
+        }
+
+    def save_dataset(self, path: str) -> None:
+        """ Save precomputed arrays into dataset directory, that can be opened with MemmapDataFeeder
+        """
+        os.makedirs(path, exist_ok=True)
+        for name, array in self._arrays().items():
+            np.save(os.path.join(path, f"{name}.npy"), array)
+
+        config = {
+            "length": len(self),
+            "ohlcv": ["open", "high", "low", "close", "volume"],
+            "indicators": [indicator.config() for indicator in self._indicators],
+            "min": float(self.min),
+            "max": float(self.max)
+        }
+        with open(os.path.join(path, "dataset.json"), 'w') as outfile:
+            json.dump(config, outfile, indent=4)
+
+
+class MemmapDataFeeder(NumpyDataFeeder):
+    """ Data feeder over dataset directory created with NumpyDataFeeder.save_dataset
+
+    Arrays are opened with numpy memory mapping, so rows are paged in lazily by the OS and processes reading 
+    the same dataset share the page cache instead of each holding a private copy. Indicators are restored 
+    from their configs without recomputation.
+    """
+    def __init__(
+            self, 
+            path: str, 
+            mmap_mode: str = "r",
+            cache_size: int = None,
+            cache_bytes: int = None,
+            ) -> None:
+        config_path = os.path.join(path, "dataset.json")
+        if not os.path.exists(config_path):
+            raise Exception(f"Dataset not found in {path}")
+
+        with open(config_path) as json_file:
+            config = json.load(json_file)
+
+        self._df = None
+        self._path = path
+        self._timestamp_format = None
+        self._timestamp_unit = 's'
+        self._min = config["min"]
+        self._max = config["max"]
+        self._indicators = [load_indicator(indicator) for indicator in config["indicators"]]
+        self._cache = StateCache(max_size=cache_size, max_bytes=cache_bytes)
+
+        # datasets saved by older versions have timestamp strings, new ones format them from epoch
+        timestamp_path = os.path.join(path, "timestamp.npy")
+        self._init_arrays(
+            timestamp=np.load(timestamp_path, mmap_mode=mmap_mode) if os.path.exists(timestamp_path) else None,
+            epoch=np.load(os.path.join(path, "epoch.npy"), mmap_mode=mmap_mode),
+            ohlcv=np.load(os.path.join(path, "ohlcv.npy"), mmap_mode=mmap_mode),
+            indicator_values=np.load(os.path.join(path, "indicators.npy"), mmap_mode=mmap_mode),
+            valid=np.load(os.path.join(path, "valid.npy"), mmap_mode=mmap_mode)
+        )
+        assert len(self._ohlcv) == config["length"], f"dataset length mismatch, expected: {config['length']}, received: {len(self._ohlcv)}"
+
+
+class SharedMemoryHandle:
+    """ Lightweight picklable description of arrays published by SharedMemoryDataFeeder
+    """
+    def __init__(
+            self, 
+            arrays: dict, 
+            indicators: list, 
+            min: float, 
+            max: float, 
+            cache_size: int = None, 
+            cache_bytes: int = None
+        ) -> None:
+        self.arrays = arrays # {array name: (shared memory name, shape, dtype string)}
+        self.indicators = indicators # indicator configs
+        self.min = min
+        self.max = max
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+
+
+class SharedMemoryDataFeeder(NumpyDataFeeder):
+    """ Data feeder that publishes its precomputed arrays once through multiprocessing.shared_memory
+
+    Pickling the feeder (e.g. when VectorizedEnv starts worker processes) only sends SharedMemoryHandle, 
+    workers attach to the same memory blocks zero-copy, so N parallel environments cost memory of one dataset. 
+    Process that created the feeder owns the blocks and must call close() to release them.
+    """
+    _append_unsupported = "arrays have fixed size"
+
+    def __init__(
+            self, 
+            df: pd.DataFrame,
+            indicators: list = [],
+            min: float = None,
+            max: float = None,
+            cache_size: int = None,
+            cache_bytes: int = None,
+            timestamp_format: str = None,
+            timestamp_unit: str = 's',
+            dtype: np.dtype = np.float64,
+            ) -> None:
+        super().__init__(
+            df=df, indicators=indicators, min=min, max=max, cache_size=cache_size, cache_bytes=cache_bytes, 
+            timestamp_format=timestamp_format, timestamp_unit=timestamp_unit, dtype=dtype
+        )
+        self._min = self.min
+        self._max = self.max
+        self._owner_pid = os.getpid()
+        self._shared_memory = {}
+
+        arrays = {}
+        for name, array in self._arrays().items():
+            shm = shared_memory.SharedMemory(create=True, size=array.nbytes or 1)
+            shared_array = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+            shared_array[:] = array
+            self._shared_memory[name] = shm
+            arrays[name] = (shm.name, array.shape, array.dtype.str)
+
+        self._handle = SharedMemoryHandle(
+            arrays=arrays,
+            indicators=[indicator.config() for indicator in self._indicators],
+            min=self._min,
+            max=self._max,
+            cache_size=cache_size,
+            cache_bytes=cache_bytes
+        )
+        # drop references to DataFrame and indicators private data copies, only shared arrays are kept
+        self._df = None
+        self._indicators = [load_indicator(config) for config in self._handle.indicators]
+        self._attach_arrays()
+
+    def _attach_arrays(self) -> None:
+        arrays = {}
+        for name, (shm_name, shape, dtype) in self._handle.arrays.items():
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=self._shared_memory[name].buf)
+
+        self._init_arrays(
+            timestamp=None,
+            epoch=arrays["epoch"],
+            ohlcv=arrays["ohlcv"],
+            indicator_values=arrays["indicators"],
+            valid=arrays["valid"]
+        )
+
+    @property
+    def handle(self) -> SharedMemoryHandle:
+        return self._handle
+
+    @classmethod
+    def attach(cls, handle: SharedMemoryHandle) -> "SharedMemoryDataFeeder":
+        """ Create feeder over arrays already published by another process
+        """
+        feeder = cls.__new__(cls)
+        feeder._df = None
+        feeder._min = handle.min
+        feeder._max = handle.max
+        feeder._indicators = [load_indicator(config) for config in handle.indicators]
+        feeder._cache = StateCache(max_size=handle.cache_size, max_bytes=handle.cache_bytes)
+        feeder._owner_pid = None
+        feeder._handle = handle
+        feeder._shared_memory = {}
+        for name, (shm_name, shape, dtype) in handle.arrays.items():
+            try:
+                # attached blocks are owned by creating process, this process must not unlink them on exit
+                shm = shared_memory.SharedMemory(name=shm_name, track=False)
+            except TypeError:
+                # python < 3.13, child processes share owner resource tracker, so registration is harmless
+                shm = shared_memory.SharedMemory(name=shm_name)
+            feeder._shared_memory[name] = shm
+
+        feeder._attach_arrays()
+        return feeder
+
+    def __reduce__(self):
+        return (self.__class__.attach, (self._handle,))
+
+    def close(self) -> None:
+        """ Release shared memory blocks, owner process also unlinks them
+        """
+        self._cache.clear()
+        self._timestamp = self._ohlcv = self._indicator_values = self._valid = None
+        for shm in self._shared_memory.values():
+            shm.close()
+            if self._owner_pid == os.getpid():
+                shm.unlink()
+
+        self._shared_memory = {}
+
+
+class StreamingDataFeeder(NumpyDataFeeder):
+    """ Data feeder that streams CSV or Parquet file in chunks, for datasets larger than RAM
+
+    Chunks flow through generator pipeline (read -> compute indicators -> buffer). Indicators are computed 
+    chunk by chunk over chunk prepended with warmup rows of previous raw data, and with state carried over 
+    from previous chunk, so values match computation over full history. Only rolling buffer of last 
+    window_size rows and current chunk is held in memory, episodes walk forward through the file.
+
+    Start of each streamed chunk is kept as checkpoint (byte offset in CSV file, warmup rows and carried 
+    indicator state), so requesting row before the buffer (e.g. random episode start) restarts the stream from 
+    the nearest preceding checkpoint instead of the beginning of the file. Parquet files seek by row groups.
+
+    Indicators are given as configs (same as in PdDataFeeder.save_config), provide their min and max when 
+    scaler requires them, because they can't be known before the whole file is read.
+    """
+    _append_unsupported = "reads candles from file"
+
+    def __init__(
+            self,
+            path: str,
+            indicators: list = [],
+            chunk_size: int = 100_000,
+            window_size: int = 50,
+            length: int = None,
+            min: float = None,
+            max: float = None,
+            cache_size: int = None,
+            cache_bytes: int = None,
+            timestamp_format: str = None,
+            timestamp_unit: str = 's',
+            dtype: np.dtype = np.float64,
+            ) -> None:
+        self._df = None
+        self._path = path
+        self._dtype = np.dtype(dtype)
+        self._timestamp_format = timestamp_format
+        self._timestamp_unit = timestamp_unit
+        self._chunk_size = chunk_size
+        self._window_size = window_size
+        self._length = length
+        self._min = min
+        self._max = max
+        self._indicator_configs = [indicator if isinstance(indicator, dict) else indicator.config() for indicator in indicators]
+        self._indicators = [load_indicator(config) for config in self._indicator_configs]
+        self._warmup = int(np.max([indicator.warmup for indicator in self._indicators], initial=0))
+        # states of rows that are no longer buffered must not pile up in cache
+        self._cache = StateCache(max_size=cache_size if cache_size is not None else chunk_size, max_bytes=cache_bytes)
+        # {first row of chunk: (warmup rows, carry of indicators)} and {first row of chunk: byte offset} of CSV file
+        self._checkpoints = {0: (None, [{} for _ in self._indicator_configs])}
+        self._offsets = {}
+
+        assert chunk_size > 0, f"chunk_size must be > 0, received: {chunk_size}"
+        assert os.path.exists(path), f"file not found: {path}"
+
+        self._rewind()
+
+    @property
+    def warmup(self) -> int:
+        return self._warmup
+
+    def _is_parquet(self) -> bool:
+        return self._path.endswith((".parquet", ".pq"))
+
+    def _read_chunks(self, columns: list = None, start: int = 0):
+        """ Generator of raw DataFrame chunks from CSV or Parquet file, starting at row start (row of checkpoint 
+        for CSV file), byte offsets of CSV chunks are recorded
+        """
+        if self._is_parquet():
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError('Please install pyarrow to stream parquet files (pip install pyarrow)')
+
+            parquet_file = pq.ParquetFile(self._path)
+            # first row group that contains start row, its preceding rows are skipped
+            group, skip = 0, start
+            while group < parquet_file.num_row_groups and skip >= parquet_file.metadata.row_group(group).num_rows:
+                skip -= parquet_file.metadata.row_group(group).num_rows
+                group += 1
+            row_groups = range(group, parquet_file.num_row_groups)
+            for batch in parquet_file.iter_batches(batch_size=self._chunk_size, columns=columns, row_groups=row_groups):
+                if skip >= batch.num_rows:
+                    skip -= batch.num_rows
+                    continue
+                yield batch.slice(skip).to_pandas()
+                skip = 0
+            return
+
+        with open(self._path, "rb") as file:
+            header = file.readline()
+            row = start
+            if start:
+                file.seek(self._offsets[start])
+            while True:
+                offset = file.tell()
+                lines = list(itertools.islice(file, self._chunk_size))
+                if not lines:
+                    return
+                self._offsets[row] = offset
+                chunk = pd.read_csv(io.BytesIO(header + b"".join(lines)), usecols=columns)
+                row += len(chunk)
+                yield chunk
+
+    def _compute_chunks(self, chunks, start: int = 0):
+        """ Generator of (timestamp, epoch, ohlcv, indicator_values) arrays of chunks with indicators computed, 
+        that continues from checkpoint at row start and records checkpoints of following chunks
+        """
+        tail, carry = self._checkpoints[start]
+        carry = copy.deepcopy(carry)
+        row = start
+        for chunk in chunks:
+            if row not in self._checkpoints:
+                self._checkpoints[row] = (tail, copy.deepcopy(carry))
+            frame = pd.concat([tail, chunk], ignore_index=True) if tail is not None else chunk.reset_index(drop=True)
+            offset = len(frame) - len(chunk)
+
+            indicator_values = []
+            store = FeatureStore(frame)
+            for i, config in enumerate(self._indicator_configs):
+                indicator = load_indicator({**config, "carry": carry[i]}, data=store)
+                # drop warmup rows of each indicator separately, as its carry state refers to its own warmup
+                indicator_values.append(indicator.to_numpy()[offset:])
+                carry[i] = indicator.carry_over()
+
+            volume = chunk['volume'] if 'volume' in chunk.columns else np.zeros(len(chunk))
+            yield (
+                chunk['timestamp'].to_numpy(),
+                parse_timestamps(chunk['timestamp'], format=self._timestamp_format, unit=self._timestamp_unit),
+                np.column_stack([chunk['open'], chunk['high'], chunk['low'], chunk['close'], volume]).astype(self._dtype),
+                np.column_stack(indicator_values).astype(self._dtype) if indicator_values else np.empty((len(chunk), 0), dtype=self._dtype)
+            )
+            # copy, so checkpoint doesn't keep whole chunk alive
+            tail = frame.iloc[-self._warmup:].copy() if self._warmup else None
+            row += len(chunk)
+
+    def validate(self) -> None:
+        """ File is not held in memory, buffer is validated now and every following chunk when it's buffered
+        """
+        if not self._validated:
+            self._validated = True
+            if self._valid.any():
+                validate_arrays(*self._validation_arrays(), offset=self._buffer_start)
+
+    def _checkpoint(self, idx: int) -> int:
+        """ Row of the nearest checkpoint at or before row idx, that stream can be restarted from
+        """
+        rows = [row for row in self._checkpoints if row <= idx and (row == 0 or self._is_parquet() or row in self._offsets)]
+        return max(rows)
+
+    def _rewind(self, start: int = 0) -> None:
+        """ Restart stream from checkpoint at row start (beginning of the file by default)
+        """
+        self._stream = self._compute_chunks(self._read_chunks(start=start), start)
+        self._buffer_start = start
+        self._init_arrays(
+            timestamp=np.empty(0, dtype=object),
+            epoch=np.empty(0, dtype=np.int64),
+            ohlcv=np.empty((0, 5), dtype=self._dtype),
+            indicator_values=np.empty((0, sum(len(indicator.names) for indicator in self._indicators)), dtype=self._dtype),
+            valid=np.empty(0, dtype=bool)
+        )
+
+    def _advance(self) -> bool:
+        """ Append next chunk to buffer and drop rows that are older than window_size, False at the end of file
+        """
+        chunk = next(self._stream, None)
+        if chunk is None:
+            return False
+
+        timestamp, epoch, ohlcv, indicator_values = chunk
+        keep = self._window_size
+        drop = max(len(self._ohlcv) - keep, 0)
+        self._buffer_start += drop
+        self._init_arrays(
+            timestamp=np.concatenate([self._timestamp[drop:], timestamp]),
+            epoch=np.concatenate([self._epoch[drop:], epoch]),
+            ohlcv=np.concatenate([self._ohlcv[drop:], ohlcv]),
+            indicator_values=np.concatenate([self._indicator_values[drop:], indicator_values]),
+            valid=np.concatenate([self._valid[drop:], ~np.isnan(indicator_values).any(axis=1)])
+        )
+        if self._validated and self._valid.any():
+            validate_arrays(*self._validation_arrays(), offset=self._buffer_start)
+        return True
+
+    def _scan(self) -> None:
+        """ Single pass over the file to find its length and price range, reading only required columns
+        """
+        length, low, high = 0, np.inf, -np.inf
+        for chunk in self._read_chunks(columns=["low", "high"]):
+            length += len(chunk)
+            low = min(low, chunk["low"].min())
+            high = max(high, chunk["high"].max())
+
+        self._length = self._length or length
+        self._min = self._min or low
+        self._max = self._max or high
+
+    @property
+    def min(self) -> float:
+        if self._min is None:
+            self._scan()
+        return self._min
+
+    @property
+    def max(self) -> float:
+        if self._max is None:
+            self._scan()
+        return self._max
+
+    def __len__(self) -> int:
+        if self._length is None:
+            self._scan()
+        return self._length
+
+    def __getitem__(self, idx: int, args=None) -> State:
+        # Use cache to speed up training
+        state = self._cache.get(idx, StateCache._missing)
+        if state is not StateCache._missing:
+            return state
+
+        if idx < 0:
+            raise IndexError(f"negative index is not supported by {self.name}, received: {idx}")
+
+        # stream restarts from checkpoint when row is before the buffer, or checkpoint is ahead of the buffer
+        start = self._checkpoint(idx)
+        if idx < self._buffer_start or start > self._buffer_start + len(self._ohlcv):
+            self._rewind(start)
+
+        while idx >= self._buffer_start + len(self._ohlcv):
+            if not self._advance():
+                raise IndexError(f"index out of range: {idx}, length: {self._buffer_start + len(self._ohlcv)}")
+
+        state = self._state(idx - self._buffer_start)
+        self._cache[idx] = state
+
+        return state
+
+
+class PanelDataFeeder(NumpyDataFeeder):
+    """ Multi-asset data feeder, that aligns instruments on common timestamp index
+
+    Fields are held in arrays of shape (time, asset, field) and indicators (given as configs, same as in 
+    PdDataFeeder.save_config) are computed on PanelFrame, vectorized across all assets at once. Indexing 
+    returns list of States, one per asset, or None while any asset has indicators not computed yet.
+
+    how='inner' keeps only timestamps present for every asset, how='outer' keeps all of them and forward fills 
+    missing rows of each asset.
+    """
+    _append_unsupported = "holds rows of multiple assets"
+
+    def __init__(
+            self,
+            dfs: dict,
+            indicators: list = [],
+            how: str = 'inner',
+            min: float = None,
+            max: float = None,
+            cache_size: int = None,
+            cache_bytes: int = None,
+            timestamp_format: str = None,
+            timestamp_unit: str = 's',
+            workers: int = 1,
+            dtype: np.dtype = np.float64,
+            ) -> None:
+        assert isinstance(dfs, dict) and len(dfs) > 0, "dfs must be a dict of {asset name: pandas.DataFrame}"
+        assert how in ['inner', 'outer'], f"how must be 'inner' or 'outer', received: {how}"
+
+        self._df = None
+        self._min = min
+        self._max = max
+        self._assets = list(dfs.keys())
+        self._cache = StateCache(max_size=cache_size, max_bytes=cache_bytes)
+
+        epochs = {}
+        for asset, df in dfs.items():
+            for column in ['timestamp', 'open', 'high', 'low', 'close']:
+                assert column in df.columns, f"df of {asset} must have '{column}' column"
+            epochs[asset] = parse_timestamps(df['timestamp'], format=timestamp_format, unit=timestamp_unit)
+            assert len(np.unique(epochs[asset])) == len(df), f"df of {asset} has duplicated timestamps"
+
+        epoch = reduce(np.intersect1d if how == 'inner' else np.union1d, epochs.values())
+
+        self._frame = PanelFrame()
+        for field in ['open', 'high', 'low', 'close', 'volume']:
+            wide = pd.DataFrame({
+                asset: pd.Series(df[field].to_numpy() if field in df.columns else np.zeros(len(df)), index=epochs[asset]).reindex(epoch)
+                for asset, df in dfs.items()
+            }, index=epoch)
+            self._frame[field] = wide.ffill() if how == 'outer' else wide
+
+        store = FeatureStore(self._frame)
+        self._indicators = load_indicators(
+            [indicator if isinstance(indicator, dict) else indicator.config() for indicator in indicators], 
+            store, workers=workers
+        )
+        store.clear()
+
+        ohlcv = np.stack([self._frame[field].to_numpy(dtype=np.float64) for field in ['open', 'high', 'low', 'close', 'volume']], axis=-1)
+        if self._indicators:
+            indicator_values = np.concatenate([indicator.to_numpy() for indicator in self._indicators], axis=-1)
+        else:
+            indicator_values = np.empty(ohlcv.shape[:2] + (0,))
+
+        self._init_arrays(
+            # timestamp strings of states are formatted from common epoch index
+            timestamp=None,
+            epoch=epoch,
+            ohlcv=np.ascontiguousarray(ohlcv, dtype=dtype),
+            indicator_values=np.ascontiguousarray(indicator_values, dtype=dtype),
+            # row is valid when every asset has prices and computed indicators
+            valid=~(np.isnan(indicator_values).any(axis=(1, 2)) | np.isnan(ohlcv[..., :4]).any(axis=(1, 2)))
+        )
+
+    @property
+    def assets(self) -> list:
+        return self._assets
+
+    @property
+    def frame(self) -> PanelFrame:
+        return self._frame
+
+    def __getitem__(self, idx: int, args=None) -> typing.List[State]:
+        # Use cache to speed up training
+        states = self._cache.get(idx, StateCache._missing)
+        if states is not StateCache._missing:
+            return states
+
+        states = [self._state(idx, asset) for asset in range(len(self._assets))] if self._valid[idx] else None
+        self._cache[idx] = states
+
+        return states
+
+    def state(self, idx: int, asset: typing.Union[int, str]) -> State:
+        """ State of single asset at row idx, asset given by its position or name
+        """
+        states = self[idx]
+        if states is None:
+            return None
 
-        pdDataFeeder = PdDataFeeder(df=df, indicators=_indicators, min=config["min"], max=config["max"])
+        return states[asset if isinstance(asset, int) else self._assets.index(asset)]
 
-        return pdDataFeeder
\ No newline at end of file
+    def _state(self, row: int, asset: int) -> State:
+        return self._batch.state((row, asset))
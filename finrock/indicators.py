@@ -1,20 +1,232 @@
+import os
+import copy
+import json
+import typing
+import hashlib
+import threading
+import numpy as np
 import pandas as pd
+from collections import deque
+from numpy.lib.stride_tricks import sliding_window_view
 
 from .render import RenderOptions, RenderType, WindowType
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 """ Implemented indicators:
 - SMA
 - Bolinger Bands
 - RSI
 - PSAR
 - MACD (Moving Average Convergence Divergence)
-
-TODO:
-- Commodity Channel Index (CCI), and X is the 
-- Average Directional Index (ADX)
+- EMA (Exponential Moving Average)
+- ATR (Average True Range)
+- ADX (Average Directional Index)
+- Stochastic Oscillator
+- CCI (Commodity Channel Index)
+- SMA, EMA and RSI sweeps over many periods (SMASweep, EMASweep, RSISweep)
 """
 
-    
+
+class PanelFrame(dict):
+    """ Fields of multiple assets aligned on common time index, each field is DataFrame of shape (time, assets)
+
+    Indicators computed on PanelFrame run the same pandas operations as on single asset DataFrame, so they are 
+    vectorized across all assets at once. Copy is shallow, indicators only add their own fields.
+    """
+    @property
+    def columns(self) -> list:
+        return list(self.keys())
+
+    def copy(self) -> "PanelFrame":
+        return PanelFrame(self)
+
+    @property
+    def index(self) -> pd.Index:
+        return next(iter(self.values())).index
+
+
+class FeatureStore:
+    """ Shared input of indicators computed on the same data
+
+    Holds reference to DataFrame (or PanelFrame) without copying it, indicators read input columns from the store 
+    and request intermediate series (rolling mean and std, ewm mean, diff) through it. Each intermediate is keyed 
+    by operation, input column and parameters and is computed only once, so e.g. SMA and BolingerBands with the 
+    same period share one rolling mean. Keys of intermediates can be used as input columns of other intermediates.
+
+    Indicators can be computed on one store from multiple threads, each intermediate is still computed only once.
+    """
+    def __init__(self, data: pd.DataFrame) -> None:
+        if isinstance(data, FeatureStore):
+            data = data.data
+        assert isinstance(data, (pd.DataFrame, PanelFrame)) == True, "data must be a pandas.DataFrame or PanelFrame"
+        self._data = data
+        self._features = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_lock'], state['_key_locks'] = None, {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def data(self) -> pd.DataFrame:
+        return self._data
+
+    @property
+    def columns(self) -> list:
+        return self._data.columns
+
+    @property
+    def index(self) -> pd.Index:
+        return self._data.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, key: typing.Union[str, tuple]) -> pd.Series:
+        """ Input column by name, or computed intermediate by its key
+        """
+        if isinstance(key, tuple):
+            return self._features[key]
+        return self._data[key]
+
+    def cached(self, key: tuple, compute: typing.Callable) -> pd.Series:
+        """ Return intermediate stored under key, compute() is called only when it's requested for the first time
+        """
+        if key in self._features:
+            self.hits += 1
+            return self._features[key]
+
+        # threads requesting the same key wait for the first one, different keys are computed concurrently
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key in self._features:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._features[key] = compute()
+
+        return self._features[key]
+
+    def clear(self) -> None:
+        """ Release intermediates, when all indicators on this data are computed
+        """
+        self._features = {}
+        self._key_locks = {}
+
+    def diff(self, column: typing.Union[str, tuple]) -> pd.Series:
+        return self.cached(('diff', column), lambda: self[column].diff())
+
+    def rolling_mean(self, column: typing.Union[str, tuple], window: int) -> pd.Series:
+        return self.cached(('rolling_mean', column, window), lambda: self[column].rolling(window).mean())
+
+    def rolling_std(self, column: typing.Union[str, tuple], window: int) -> pd.Series:
+        return self.cached(('rolling_std', column, window), lambda: self[column].rolling(window).std())
+
+    def rolling_min(self, column: typing.Union[str, tuple], window: int) -> pd.Series:
+        return self.cached(('rolling_min', column, window), lambda: self[column].rolling(window).min())
+
+    def rolling_max(self, column: typing.Union[str, tuple], window: int) -> pd.Series:
+        return self.cached(('rolling_max', column, window), lambda: self[column].rolling(window).max())
+
+    def ewm_mean(self, column: typing.Union[str, tuple], **kwargs) -> pd.Series:
+        return self.cached(('ewm_mean', column, tuple(sorted(kwargs.items()))), lambda: self[column].ewm(**kwargs).mean())
+
+
+
+class RollingWindow:
+    """ Last `period` values with running sum and sum of squares, for O(1) rolling mean and std updates
+
+    Sums are kept relative to shift value and recomputed exactly each time window is renewed, so float error doesn't 
+    accumulate over long streams.
+    """
+    def __init__(self, period: int, values: list=[]) -> None:
+        self._period = period
+        self._values = deque(maxlen=period)
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._updates = 0
+        for value in list(values)[-period:]:
+            self._values.append(value)
+        self._resync()
+
+    def _resync(self):
+        values = np.array(self._values, dtype=np.float64)
+        self._shift = values[0] if len(values) else 0.0
+        self._sum = np.sum(values - self._shift)
+        self._sumsq = np.sum((values - self._shift) ** 2)
+        self._updates = 0
+
+    def append(self, value: float) -> None:
+        if len(self._values) == self._period:
+            removed = self._values[0] - self._shift
+            self._sum -= removed
+            self._sumsq -= removed * removed
+
+        self._values.append(value)
+        added = value - self._shift
+        self._sum += added
+        self._sumsq += added * added
+
+        self._updates += 1
+        if self._updates >= self._period:
+            self._resync()
+
+    @property
+    def full(self) -> bool:
+        return len(self._values) == self._period
+
+    def mean(self) -> float:
+        return self._shift + self._sum / len(self._values)
+
+    def std(self) -> float:
+        # sample standard deviation, same as pandas rolling std (ddof=1)
+        n = len(self._values)
+        return np.sqrt(max(self._sumsq - self._sum * self._sum / n, 0.0) / (n - 1))
+
+
+class OnlineIndicator:
+    """ Streaming counterpart of computed indicator, keeps O(1) state and returns values of each new bar
+
+    Holds its own copy of indicator state, so several online indicators can follow different streams of one 
+    indicator. Values of bars passed to update are the same as compute() over history followed by these bars.
+    """
+    def __init__(self, indicator: "Indicator", history: pd.DataFrame=None) -> None:
+        self._indicator = copy.copy(indicator)
+        self._indicator._online = None
+        if history is None:
+            columns = dict.fromkeys(['open', 'high', 'low', 'close', 'volume', indicator.target_column])
+            history = pd.DataFrame(columns=list(columns), dtype=np.float64)
+        self._indicator.warm_start(history)
+
+    @property
+    def name(self) -> str:
+        return self._indicator.name
+
+    @property
+    def names(self) -> list:
+        return self._indicator.names
+
+    def update(self, value: typing.Union[float, dict]) -> list:
+        """ Values (ordered as names) of new bar, value is price of target column or candle dict
+        """
+        candle = value if isinstance(value, dict) else {self._indicator.target_column: value}
+        return self._indicator.update(candle)
+
+
 class Indicator:
     """ Base class for indicators
     """
@@ -25,20 +237,33 @@ class Indicator:
             render_options: dict={},
             min: float=None,
             max: float=None,
+            carry: dict=None,
+            cache_dir: str=None,
             **kwargs
         ) -> None:
-        self._data = data.copy()
+        # inputs are read from store shared with other indicators, only computed columns are owned by indicator
+        self._store = (data if isinstance(data, FeatureStore) else FeatureStore(data)) if data is not None else None
+        self._outputs = {}
         self._target_column = target_column
         self._custom_render_options = render_options
         self._render_options = render_options
-        self._min = min # if min is not None else self._data[target_column].min()
-        self._max = max # if max is not None else self._data[target_column].max()
+        self._min = min
+        self._max = max
         self.values = {}
+        self._carry = carry or {}
+        self._carry_over = {}
+        self._cache_dir = cache_dir
+        self._online = None
 
-        assert isinstance(self._data, pd.DataFrame) == True, "data must be a pandas.DataFrame"
-        assert self._target_column in self._data.columns, f"data must have '{self._target_column}' column"
+        # data is None when indicator columns are already computed (e.g. loaded from a dataset directory)
+        if self._store is not None:
+            assert self._target_column in self._store.columns, f"data must have '{self._target_column}' column"
+
+            if self._cache_dir is None:
+                self.compute()
+            else:
+                self._compute_cached()
 
-        self.compute()
         if not self._custom_render_options:
             self._render_options = self.default_render_options() 
 
@@ -78,6 +303,70 @@ class Indicator:
     def names(self):
         return self._names
     
+    @property
+    def warmup(self) -> int:
+        """ Number of previous rows that must precede new data, so compute() reproduces full history values
+        """
+        return 0
+
+    def carry_over(self) -> dict:
+        """ State that compute() can't recover from warmup rows, passed as `carry` to indicator computed on next chunk
+        """
+        return self._carry_over
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        """ Initialize incremental state from history rows (at least last warmup rows), that precede candles passed to update
+        """
+        raise NotImplementedError(f"{self.name} doesn't support incremental updates")
+
+    def update(self, candle: dict) -> list:
+        """ Values (ordered as names) of new candle that follows history, computed in O(1) from incremental state
+        """
+        raise NotImplementedError(f"{self.name} doesn't support incremental updates")
+
+    def online(self, history: pd.DataFrame=None) -> "OnlineIndicator":
+        """ Independent online indicator, that continues after history rows (starts from the first bar when None)
+        """
+        return OnlineIndicator(self, history)
+
+    def _cache_key(self) -> str:
+        """ Hash of input price columns, computation parameters and carried state
+        """
+        key = hashlib.sha1()
+        for column in sorted({'open', 'high', 'low', 'close', 'volume', self.target_column}):
+            if column in self._store.columns:
+                key.update(column.encode())
+                key.update(np.ascontiguousarray(self._store[column].to_numpy(dtype=np.float64)).tobytes())
+
+        # min and max are derived from computed columns, they don't change computation
+        config = {k: v for k, v in self.config().items() if k not in ['min', 'max']}
+        key.update(json.dumps([config, self._carry], sort_keys=True, default=float).encode())
+
+        return key.hexdigest()
+
+    def _compute_cached(self):
+        """ Load computed columns from cache_dir when the same data and config were computed before, otherwise 
+        compute them and store for the next run
+        """
+        path = os.path.join(self._cache_dir, f"{self.name}_{self._cache_key()}.npz")
+        if os.path.exists(path):
+            with np.load(path) as cached:
+                # values are (time, names) or (time, assets, names) for PanelFrame, columns are wrapped as input column
+                values, template = cached["values"], self._store[self.target_column]
+                for i, name in enumerate(self.names):
+                    self._outputs[name] = _like(values[..., i], template)
+                self._carry_over = json.loads(str(cached["carry_over"]))
+            return
+
+        self.compute()
+
+        # write into temporary file and rename, so parallel runs never read partially written file
+        os.makedirs(self._cache_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as outfile:
+            np.savez(outfile, values=self.to_numpy(), carry_over=json.dumps(self._carry_over, default=float))
+        os.replace(temp_path, path)
+
     def compute(self):
         raise NotImplementedError
     
@@ -87,18 +376,33 @@ class Indicator:
     def render_options(self):
         return {name: option.copy() for name, option in self._render_options.items()}
 
-    def __getitem__(self, index: int):
-        row = self._data.iloc[index]
-        for name in self.names:
-            if pd.isna(row[name]):
+    def to_numpy(self) -> np.ndarray:
+        """ Return computed indicator columns as contiguous array of shape (len(data), len(names)), 
+        (time, assets, len(names)) for PanelFrame
+        """
+        return np.ascontiguousarray(np.stack([self._outputs[name].to_numpy(dtype=np.float64) for name in self.names], axis=-1))
+
+    def update_values(self, values: list):
+        """ Set current indicator values (ordered as names) and return serialised indicator, None if any value is nan
+        """
+        for name, value in zip(self.names, values):
+            if pd.isna(value):
                 return None
             
-            self.values[name] = row[name]
+            self.values[name] = value
             if self._render_options.get(name):
-                self._render_options[name].value = row[name]
+                self._render_options[name].value = value
 
         return self.serialise()
 
+    def values_at(self, index: int) -> list:
+        """ Numeric indicator values (ordered as names) at index, without building serialised indicator
+        """
+        return [self._outputs[name].iloc[index] for name in self.names]
+
+    def __getitem__(self, index: int):
+        return self.update_values(self.values_at(index))
+
     def __call__(self, index: int):
         return self[index]
     
@@ -148,8 +452,9 @@ class SMA(Indicator):
         self._period = period
         self._names = [f'SMA{period}']
         super().__init__(data, target_column, render_options, **kwargs)
-        self.min = self._data[self._names[0]].min()
-        self.max = self._data[self._names[0]].max()
+        if self._store is not None:
+            self.min = np.nanmin(self._outputs[self._names[0]])
+            self.max = np.nanmax(self._outputs[self._names[0]])
     
     def default_render_options(self):
         return {name: RenderOptions(
@@ -161,8 +466,19 @@ class SMA(Indicator):
             max=self.max
         ) for name in self._names}
 
+    @property
+    def warmup(self) -> int:
+        return self._period - 1
+
     def compute(self):
-        self._data[self.names[0]] = self._data[self.target_column].rolling(self._period).mean()
+        self._outputs[self.names[0]] = self._store.rolling_mean(self.target_column, self._period)
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        self._online = RollingWindow(self._period, history[self.target_column].iloc[-self._period:].tolist())
+
+    def update(self, candle: dict) -> list:
+        self._online.append(candle[self.target_column])
+        return [self._online.mean() if self._online.full else np.nan]
 
     def config(self):
         config = super().config()
@@ -198,13 +514,31 @@ class BolingerBands(Indicator):
         self._std = std
         self._names = ['SMA', 'BB_up', 'BB_dn']
         super().__init__(data, target_column, render_options, **kwargs)
-        self.min = self._data['BB_dn'].min()
-        self.max = self._data['BB_up'].max()
+        if self._store is not None:
+            self.min = np.nanmin(self._outputs['BB_dn'])
+            self.max = np.nanmax(self._outputs['BB_up'])
+
+    @property
+    def warmup(self) -> int:
+        return self._period - 1
 
     def compute(self):
-        self._data['SMA'] = self._data[self.target_column].rolling(self._period).mean()
-        self._data['BB_up'] = self._data['SMA'] + self._data[self.target_column].rolling(self._period).std() * self._std
-        self._data['BB_dn'] = self._data['SMA'] - self._data[self.target_column].rolling(self._period).std() * self._std
+        sma = self._store.rolling_mean(self.target_column, self._period)
+        std = self._store.rolling_std(self.target_column, self._period)
+        self._outputs['SMA'] = sma
+        self._outputs['BB_up'] = sma + std * self._std
+        self._outputs['BB_dn'] = sma - std * self._std
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        self._online = RollingWindow(self._period, history[self.target_column].iloc[-self._period:].tolist())
+
+    def update(self, candle: dict) -> list:
+        self._online.append(candle[self.target_column])
+        if not self._online.full:
+            return [np.nan, np.nan, np.nan]
+
+        sma, std = self._online.mean(), self._online.std()
+        return [sma, sma + std * self._std, sma - std * self._std]
 
     def default_render_options(self):
         return {name: RenderOptions(
@@ -244,14 +578,45 @@ class RSI(Indicator):
         self._names = ['RSI']
         super().__init__(data, target_column, render_options, min=min, max=max, **kwargs)
 
+    @property
+    def warmup(self) -> int:
+        # exponential weights of older rows fall below float precision, (1 - 1 / period) ** (40 * period) < 1e-17
+        return 40 * self._period
+
     def compute(self):
-        delta = self._data[self.target_column].diff()
-        up = delta.clip(lower=0)
-        down = -1 * delta.clip(upper=0)
-        ema_up = up.ewm(com=self._period-1, adjust=True, min_periods=self._period).mean()
-        ema_down = down.ewm(com=self._period-1, adjust=True, min_periods=self._period).mean()
+        delta = self._store.diff(self.target_column)
+        # gains and losses are intermediates too, so RSIs of different periods share them
+        self._store.cached(('gain', self.target_column), lambda: delta.clip(lower=0))
+        self._store.cached(('loss', self.target_column), lambda: -1 * delta.clip(upper=0))
+        ema_up = self._store.ewm_mean(('gain', self.target_column), com=self._period-1, adjust=True, min_periods=self._period)
+        ema_down = self._store.ewm_mean(('loss', self.target_column), com=self._period-1, adjust=True, min_periods=self._period)
         rs = ema_up / ema_down
-        self._data['RSI'] = 100 - (100 / (1 + rs))
+        self._outputs['RSI'] = 100 - (100 / (1 + rs))
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        # adjusted ewm is ratio of decayed sums, their common denominator cancels out in ema_up / ema_down
+        self._online = {'close': np.nan, 'up': 0.0, 'down': 0.0, 'count': 0}
+        for close in history[self.target_column].iloc[-(self.warmup + 1):].tolist():
+            self.update({self.target_column: close})
+
+    def update(self, candle: dict) -> list:
+        state = self._online
+        close = candle[self.target_column]
+        delta, state['close'] = close - state['close'], close
+        if np.isnan(delta):
+            return [np.nan]
+
+        decay = 1 - 1 / self._period
+        state['up'] = state['up'] * decay + max(delta, 0.0)
+        state['down'] = state['down'] * decay + max(-delta, 0.0)
+        state['count'] += 1
+
+        if state['count'] < self._period or state['up'] == state['down'] == 0:
+            return [np.nan]
+        if state['down'] == 0:
+            return [100.0]
+
+        return [100 - (100 / (1 + state['up'] / state['down']))]
 
     def default_render_options(self):
         custom_options = {
@@ -287,6 +652,100 @@ class RSI(Indicator):
         return config
 
 
+def _psar_loop(high, low, psar, step, max_step, up_trend, acceleration_factor, up_trend_high, down_trend_low):
+    """ Fill psar[2:] in place from psar of two first rows and trend state, returns trend state after the last row
+
+    Works on plain sequences, it's compiled with numba when installed and runs over python lists otherwise.
+    """
+    for i in range(2, len(psar)):
+        reversal = False
+
+        max_high = high[i]
+        min_low = low[i]
+
+        if up_trend:
+            psar[i] = psar[i - 1] + (
+                acceleration_factor * (up_trend_high - psar[i - 1])
+            )
+
+            if min_low < psar[i]:
+                reversal = True
+                psar[i] = up_trend_high
+                down_trend_low = min_low
+                acceleration_factor = step
+            else:
+                if max_high > up_trend_high:
+                    up_trend_high = max_high
+                    acceleration_factor = min(
+                        acceleration_factor + step, max_step
+                    )
+
+                low1 = low[i - 1]
+                low2 = low[i - 2]
+                if low2 < psar[i]:
+                    psar[i] = low2
+                elif low1 < psar[i]:
+                    psar[i] = low1
+        else:
+            psar[i] = psar[i - 1] - (
+                acceleration_factor * (psar[i - 1] - down_trend_low)
+            )
+
+            if max_high > psar[i]:
+                reversal = True
+                psar[i] = down_trend_low
+                up_trend_high = max_high
+                acceleration_factor = step
+            else:
+                if min_low < down_trend_low:
+                    down_trend_low = min_low
+                    acceleration_factor = min(
+                        acceleration_factor + step, max_step
+                    )
+
+                high1 = high[i - 1]
+                high2 = high[i - 2]
+                if high2 > psar[i]:
+                    psar[i] = high2
+                elif high1 > psar[i]:
+                    psar[i] = high1
+
+        up_trend = up_trend != reversal  # XOR
+
+    return up_trend, acceleration_factor, up_trend_high, down_trend_low
+
+
+_psar_compiled = njit(cache=True, nogil=True)(_psar_loop) if njit is not None else None
+
+
+def psar_kernel(high: np.ndarray, low: np.ndarray, psar: np.ndarray, step: float, max_step: float, state: dict) -> dict:
+    """ Compute psar[2:] in place from psar of two first rows, highs and lows, trend state is read from and 
+    written to state dict (up_trend, acceleration_factor, up_trend_high, down_trend_low)
+    """
+    args = (
+        bool(state['up_trend']), float(state['acceleration_factor']), 
+        float(state['up_trend_high']), float(state['down_trend_low'])
+    )
+    if _psar_compiled is not None:
+        result = _psar_compiled(
+            np.ascontiguousarray(high, dtype=np.float64), np.ascontiguousarray(low, dtype=np.float64), 
+            psar, float(step), float(max_step), *args
+        )
+    else:
+        # indexing python lists is several times faster than indexing numpy arrays element by element
+        values = psar.tolist()
+        result = _psar_loop(
+            np.asarray(high, dtype=np.float64).tolist(), np.asarray(low, dtype=np.float64).tolist(), 
+            values, step, max_step, *args
+        )
+        psar[:] = values
+
+    state['up_trend'], state['acceleration_factor'], state['up_trend_high'], state['down_trend_low'] = result
+    state['up_trend'] = bool(state['up_trend'])
+
+    return state
+
+
 class PSAR(Indicator):
     """ Parabolic Stop and Reverse (Parabolic SAR)
 
@@ -311,8 +770,9 @@ class PSAR(Indicator):
         self._step = step
         self._max_step = max_step
         super().__init__(data, target_column, render_options, **kwargs)
-        self.min = self._data['PSAR'].min()
-        self.max = self._data['PSAR'].max()
+        if self._store is not None:
+            self.min = np.nanmin(self._outputs['PSAR'])
+            self.max = np.nanmax(self._outputs['PSAR'])
 
     def default_render_options(self):
         return {name: RenderOptions(
@@ -325,81 +785,87 @@ class PSAR(Indicator):
         ) for name in self._names}
 
     def compute(self):
-        high = self._data['high']
-        low = self._data['low']
-        close = self._data[self.target_column]
+        high = self._store['high']
+        low = self._store['low']
+        close = self._store[self.target_column]
 
-        up_trend = True
-        acceleration_factor = self._step
-        up_trend_high = high.iloc[0]
-        down_trend_low = low.iloc[0]
+        if isinstance(close, pd.DataFrame):
+            # panel of assets, every asset column has its own trend state
+            assert not self._carry, "carry is not supported for panel data"
+            self._outputs['PSAR'] = pd.DataFrame({
+                column: self._compute_series(high[column], low[column], close[column], {})[0] for column in close.columns
+            }, index=close.index)
+            return
 
-        self._psar = close.copy()
-        self._psar_up = pd.Series(index=self._psar.index, dtype="float64")
-        self._psar_down = pd.Series(index=self._psar.index, dtype="float64")
+        self._outputs['PSAR'], self._carry_over = self._compute_series(high, low, close, self._carry)
 
-        for i in range(2, len(close)):
-            reversal = False
+    def _compute_series(self, high: pd.Series, low: pd.Series, close: pd.Series, carry: dict):
+        """ Compute psar of single asset, starting from carried state, returns psar series and state to carry over
+        """
+        # continue from state of previous chunk, when computed chunk by chunk
+        state = {
+            'up_trend': carry.get('up_trend', True),
+            'acceleration_factor': carry.get('acceleration_factor', self._step),
+            'up_trend_high': carry.get('up_trend_high', high.iloc[0]),
+            'down_trend_low': carry.get('down_trend_low', low.iloc[0]),
+        }
 
-            max_high = high.iloc[i]
-            min_low = low.iloc[i]
+        psar = close.to_numpy(dtype=np.float64, copy=True)
+        if 'psar' in carry:
+            psar[:len(carry['psar'])] = carry['psar']
 
-            if up_trend:
-                self._psar.iloc[i] = self._psar.iloc[i - 1] + (
-                    acceleration_factor * (up_trend_high - self._psar.iloc[i - 1])
-                )
+        psar_kernel(high.to_numpy(), low.to_numpy(), psar, self._step, self._max_step, state)
 
-                if min_low < self._psar.iloc[i]:
-                    reversal = True
-                    self._psar.iloc[i] = up_trend_high
-                    down_trend_low = min_low
-                    acceleration_factor = self._step
-                else:
-                    if max_high > up_trend_high:
-                        up_trend_high = max_high
-                        acceleration_factor = min(
-                            acceleration_factor + self._step, self._max_step
-                        )
-
-                    low1 = low.iloc[i - 1]
-                    low2 = low.iloc[i - 2]
-                    if low2 < self._psar.iloc[i]:
-                        self._psar.iloc[i] = low2
-                    elif low1 < self._psar.iloc[i]:
-                        self._psar.iloc[i] = low1
-            else:
-                self._psar.iloc[i] = self._psar.iloc[i - 1] - (
-                    acceleration_factor * (self._psar.iloc[i - 1] - down_trend_low)
-                )
+        carry_over = {**state, 'psar': psar[-self.warmup:].tolist()}
 
-                if max_high > self._psar.iloc[i]:
-                    reversal = True
-                    self._psar.iloc[i] = down_trend_low
-                    up_trend_high = max_high
-                    acceleration_factor = self._step
-                else:
-                    if min_low < down_trend_low:
-                        down_trend_low = min_low
-                        acceleration_factor = min(
-                            acceleration_factor + self._step, self._max_step
-                        )
-
-                    high1 = high.iloc[i - 1]
-                    high2 = high.iloc[i - 2]
-                    if high2 > self._psar.iloc[i]:
-                        self._psar[i] = high2
-                    elif high1 > self._psar.iloc[i]:
-                        self._psar.iloc[i] = high1
-
-            up_trend = up_trend != reversal  # XOR
-
-            if up_trend:
-                self._psar_up.iloc[i] = self._psar.iloc[i]
-            else:
-                self._psar_down.iloc[i] = self._psar.iloc[i]
+        return pd.Series(psar, index=close.index, name=close.name), carry_over
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        carry_over = self._carry_over
+        if len(history) < self.warmup:
+            # first rows of psar are close prices, trend starts from high and low of the first row
+            self._online = {'psar': [], 'high': [], 'low': []}
+            for _, row in history.iterrows():
+                self.update(row.to_dict())
+            return
+
+        if not carry_over or self._store is None or len(history) != len(self._store):
+            # trend state depends on whole history, when indicator wasn't computed on it
+            _, carry_over = self._compute_series(history['high'], history['low'], history[self.target_column], {})
+
+        self._online = {
+            **carry_over,
+            'high': history['high'].iloc[-2:].tolist(),
+            'low': history['low'].iloc[-2:].tolist(),
+        }
+
+    def update(self, candle: dict) -> list:
+        state = self._online
+        assert 'high' in candle and 'low' in candle, "PSAR update requires candle with 'high' and 'low'"
+        if len(state['psar']) < self.warmup:
+            if not state['psar']:
+                state.update(up_trend=True, acceleration_factor=self._step, up_trend_high=candle['high'], down_trend_low=candle['low'])
+            state['psar'].append(candle[self.target_column])
+            state['high'].append(candle['high'])
+            state['low'].append(candle['low'])
+            return [candle[self.target_column]]
+
+        # kernel step over two previous rows and the new one
+        high = state['high'] + [candle['high']]
+        low = state['low'] + [candle['low']]
+        psar = np.array(state['psar'] + [np.nan])
+        psar_kernel(high, low, psar, self._step, self._max_step, state)
 
-        # calculate psar indicator
-        self._data['PSAR'] = self._psar
+        state['psar'] = psar[1:].tolist()
+        state['high'] = high[1:]
+        state['low'] = low[1:]
+
+        return [psar[2]]
+
+    @property
+    def warmup(self) -> int:
+        # psar of each row depends on two previous rows
+        return 2
 
     def config(self):
         config = super().config()
@@ -426,21 +892,43 @@ class MACD(Indicator):
         self._histogram = histogram
         self._names = ['MACD', 'MACD_signal']
         super().__init__(data, target_column, render_options, **kwargs)
-        self.min = self._data['MACD_signal'].min()
-        self.max = self._data['MACD_signal'].max()
+        if self._store is not None:
+            self.min = np.nanmin(self._outputs['MACD_signal'])
+            self.max = np.nanmax(self._outputs['MACD_signal'])
+
+    @property
+    def warmup(self) -> int:
+        # exponential weights of older rows fall below float precision, (1 - 2 / (span + 1)) ** (20 * (span + 1)) < 1e-17
+        return 20 * (max(self._fast_ma, self._slow_ma, 9) + 1)
 
     def compute(self):
         # Calculate the Short Term Exponential Moving Average (EMA)
-        short_ema = self._data[self.target_column].ewm(span=self._fast_ma, adjust=False).mean()
+        short_ema = self._store.ewm_mean(self.target_column, span=self._fast_ma, adjust=False)
 
         # Calculate the Long Term Exponential Moving Average (EMA)
-        long_ema = self._data[self.target_column].ewm(span=self._slow_ma, adjust=False).mean()
+        long_ema = self._store.ewm_mean(self.target_column, span=self._slow_ma, adjust=False)
 
         # Calculate the Moving Average Convergence/Divergence (MACD)
-        self._data["MACD"] = short_ema - long_ema
+        self._outputs["MACD"] = short_ema - long_ema
 
         # Calculate the Signal Line
-        self._data["MACD_signal"] = self._data["MACD"].ewm(span=9, adjust=False).mean()
+        self._outputs["MACD_signal"] = self._outputs["MACD"].ewm(span=9, adjust=False).mean()
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        self._online = {'short_ema': None, 'long_ema': None, 'signal': None}
+        for close in history[self.target_column].iloc[-(self.warmup + 1):].tolist():
+            self.update({self.target_column: close})
+
+    def update(self, candle: dict) -> list:
+        state = self._online
+        close = candle[self.target_column]
+
+        state['short_ema'] = _ema_step(state['short_ema'], close, 2 / (self._fast_ma + 1))
+        state['long_ema'] = _ema_step(state['long_ema'], close, 2 / (self._slow_ma + 1))
+        macd = state['short_ema'] - state['long_ema']
+        state['signal'] = _ema_step(state['signal'], macd, 2 / (9 + 1))
+
+        return [macd, state['signal']]
 
     def default_render_options(self):
         return {name: RenderOptions(
@@ -457,4 +945,729 @@ class MACD(Indicator):
         config['fast_ma'] = self._fast_ma
         config['slow_ma'] = self._slow_ma
         config['histogram'] = self._histogram
-        return config
\ No newline at end of file
+        return config
+
+class EMA(Indicator):
+    """ Trend indicator
+
+    An exponential moving average (EMA) is a type of moving average that places a greater weight and significance on 
+    the most recent data points. It reacts more significantly to recent price changes than a simple moving average (SMA).
+
+    https://www.investopedia.com/terms/e/ema.asp
+    """
+    def __init__(
+            self, 
+            data: pd.DataFrame, 
+            period: int=20, 
+            target_column: str='close',
+            render_options: dict={},
+            **kwargs
+        ):
+        self._period = period
+        self._names = [f'EMA{period}']
+        super().__init__(data, target_column, render_options, **kwargs)
+        if self._store is not None:
+            self.min = np.nanmin(self._outputs[self._names[0]])
+            self.max = np.nanmax(self._outputs[self._names[0]])
+
+    def default_render_options(self):
+        return {name: RenderOptions(
+            name=name,
+            color=(255, 165, 0),
+            window_type=WindowType.MAIN,
+            render_type=RenderType.LINE,
+            min=self.min,
+            max=self.max
+        ) for name in self._names}
+
+    @property
+    def warmup(self) -> int:
+        # same as MACD, weight of older rows falls below float precision
+        return 20 * (self._period + 1)
+
+    def compute(self):
+        self._outputs[self.names[0]] = self._store.ewm_mean(self.target_column, span=self._period, adjust=False)
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        self._online = None
+        for close in history[self.target_column].iloc[-(self.warmup + 1):].tolist():
+            self.update({self.target_column: close})
+
+    def update(self, candle: dict) -> list:
+        self._online = _ema_step(self._online, candle[self.target_column], 2 / (self._period + 1))
+        return [self._online]
+
+    def config(self):
+        config = super().config()
+        config['period'] = self._period
+        return config
+
+
+def _ema_step(previous: float, value: float, alpha: float) -> float:
+    """ One step of exponential smoothing (pandas ewm with adjust=False), that starts from the first value
+    """
+    return value if previous is None else (1 - alpha) * previous + alpha * value
+
+
+def _true_range(store: FeatureStore) -> pd.Series:
+    """ Greatest of high - low, |high - previous close| and |low - previous close|, first row is high - low
+    """
+    def compute():
+        high, low, previous_close = store['high'], store['low'], store['close'].shift(1)
+        return np.fmax(high - low, np.fmax((high - previous_close).abs(), (low - previous_close).abs()))
+
+    return store.cached(('true_range',), compute)
+
+
+class ATR(Indicator):
+    """ Volatility indicator
+
+    The average true range (ATR), developed by J. Welles Wilder, is a moving average of true ranges, smoothed with 
+    Wilder's method (exponential smoothing with alpha = 1 / period). True range is the greatest of current high less 
+    current low, absolute value of current high less previous close and absolute value of current low less previous close.
+
+    https://www.investopedia.com/terms/a/atr.asp
+    """
+    def __init__(
+            self, 
+            data: pd.DataFrame, 
+            period: int=14, 
+            target_column: str='close',
+            render_options: dict={},
+            **kwargs
+        ):
+        self._period = period
+        self._names = ['ATR']
+        super().__init__(data, target_column, render_options, **kwargs)
+        if self._store is not None:
+            self.min = np.nanmin(self._outputs['ATR'])
+            self.max = np.nanmax(self._outputs['ATR'])
+
+    def default_render_options(self):
+        return {name: RenderOptions(
+            name=name,
+            color=(100, 100, 255),
+            window_type=WindowType.SEPERATE,
+            render_type=RenderType.LINE,
+            min=self.min,
+            max=self.max
+        ) for name in self._names}
+
+    @property
+    def warmup(self) -> int:
+        # same as RSI, weight of older rows falls below float precision
+        return 40 * self._period
+
+    def compute(self):
+        _true_range(self._store)
+        self._outputs['ATR'] = self._store.ewm_mean(('true_range',), alpha=1 / self._period, adjust=False, min_periods=self._period)
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        self._online = {'close': None, 'atr': None, 'count': 0}
+        for candle in history[['high', 'low', 'close']].iloc[-(self.warmup + 1):].to_dict('records'):
+            self.update(candle)
+
+    def update(self, candle: dict) -> list:
+        state = self._online
+        high, low, previous_close = candle['high'], candle['low'], state['close']
+        true_range = high - low if previous_close is None else max(high - low, abs(high - previous_close), abs(low - previous_close))
+        state['close'] = candle['close']
+        state['atr'] = _ema_step(state['atr'], true_range, 1 / self._period)
+        state['count'] += 1
+
+        return [state['atr'] if state['count'] >= self._period else np.nan]
+
+    def config(self):
+        config = super().config()
+        config['period'] = self._period
+        return config
+
+
+class ADX(Indicator):
+    """ Trend strength indicator
+
+    The average directional index (ADX), developed by J. Welles Wilder, measures strength of a trend regardless of its 
+    direction. Positive and negative directional indicators (DI_plus, DI_minus) are Wilder smoothed directional 
+    movements relative to average true range, ADX is Wilder smoothed difference between them relative to their sum.
+
+    https://www.investopedia.com/terms/a/adx.asp
+    """
+    def __init__(
+            self, 
+            data: pd.DataFrame, 
+            period: int=14, 
+            target_column: str='close',
+            render_options: dict={},
+            min: float=0.0,
+            max: float=100.0,
+            **kwargs
+        ):
+        self._period = period
+        self._names = ['ADX', 'DI_plus', 'DI_minus']
+        super().__init__(data, target_column, render_options, min=min, max=max, **kwargs)
+
+    def default_render_options(self):
+        colors = {'ADX': (100, 100, 255), 'DI_plus': (0, 200, 0), 'DI_minus': (200, 0, 0)}
+        return {name: RenderOptions(
+            name=name,
+            color=colors[name],
+            window_type=WindowType.SEPERATE,
+            render_type=RenderType.LINE,
+            min=self.min,
+            max=self.max
+        ) for name in self._names}
+
+    @property
+    def warmup(self) -> int:
+        # ADX smooths directional index, that is itself smoothed
+        return 80 * self._period
+
+    def compute(self):
+        _true_range(self._store)
+        up_move = self._store.diff('high')
+        down_move = -1 * self._store.diff('low')
+        # first row has no previous row, so it has no directional movement
+        self._store.cached(('plus_dm',), lambda: up_move.where((up_move > down_move) & (up_move > 0), 0.0))
+        self._store.cached(('minus_dm',), lambda: down_move.where((down_move > up_move) & (down_move > 0), 0.0))
+
+        wilder = {'alpha': 1 / self._period, 'adjust': False, 'min_periods': self._period}
+        atr = self._store.ewm_mean(('true_range',), **wilder)
+        plus_di = 100 * self._store.ewm_mean(('plus_dm',), **wilder) / atr
+        minus_di = 100 * self._store.ewm_mean(('minus_dm',), **wilder) / atr
+
+        # no directional movement in either direction is zero directional index
+        di_sum = plus_di + minus_di
+        dx = (100 * (plus_di - minus_di).abs() / di_sum).where(di_sum != 0, 0.0)
+
+        self._outputs['ADX'] = dx.ewm(**wilder).mean()
+        self._outputs['DI_plus'] = plus_di
+        self._outputs['DI_minus'] = minus_di
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        self._online = {'high': None, 'low': None, 'close': None, 'atr': None, 'plus_dm': None, 'minus_dm': None, 'count': 0, 'adx': None, 'adx_count': 0}
+        for candle in history[['high', 'low', 'close']].iloc[-(self.warmup + 1):].to_dict('records'):
+            self.update(candle)
+
+    def update(self, candle: dict) -> list:
+        state = self._online
+        high, low = candle['high'], candle['low']
+        if state['close'] is None:
+            true_range, plus_dm, minus_dm = high - low, 0.0, 0.0
+        else:
+            true_range = max(high - low, abs(high - state['close']), abs(low - state['close']))
+            up_move, down_move = high - state['high'], state['low'] - low
+            plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+            minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+        state['high'], state['low'], state['close'] = high, low, candle['close']
+
+        alpha = 1 / self._period
+        state['atr'] = _ema_step(state['atr'], true_range, alpha)
+        state['plus_dm'] = _ema_step(state['plus_dm'], plus_dm, alpha)
+        state['minus_dm'] = _ema_step(state['minus_dm'], minus_dm, alpha)
+        state['count'] += 1
+        if state['count'] < self._period:
+            return [np.nan, np.nan, np.nan]
+
+        # zero true range over whole smoothing window leaves directional indicators undefined, same as 0 / 0 in compute
+        if state['atr'] == 0:
+            plus_di = minus_di = dx = np.nan
+        else:
+            plus_di = 100 * state['plus_dm'] / state['atr']
+            minus_di = 100 * state['minus_dm'] / state['atr']
+            di_sum = plus_di + minus_di
+            dx = 100 * abs(plus_di - minus_di) / di_sum if di_sum != 0 else 0.0
+
+        state['adx'] = _ema_step(state['adx'], dx, alpha)
+        state['adx_count'] += 1
+
+        return [state['adx'] if state['adx_count'] >= self._period else np.nan, plus_di, minus_di]
+
+    def config(self):
+        config = super().config()
+        config['period'] = self._period
+        return config
+
+
+class Stochastic(Indicator):
+    """ Momentum indicator
+
+    The stochastic oscillator, developed by George Lane, compares closing price to the range of prices over period. 
+    %K is position of close between lowest low and highest high of last k_period rows (0 - 100), %D is simple 
+    moving average of %K over d_period rows. Readings above 80 are considered overbought and below 20 oversold.
+
+    https://www.investopedia.com/terms/s/stochasticoscillator.asp
+    """
+    def __init__(
+            self, 
+            data: pd.DataFrame, 
+            k_period: int=14, 
+            d_period: int=3,
+            target_column: str='close',
+            render_options: dict={},
+            min: float=0.0,
+            max: float=100.0,
+            **kwargs
+        ):
+        self._k_period = k_period
+        self._d_period = d_period
+        self._names = ['STOCH_K', 'STOCH_D']
+        super().__init__(data, target_column, render_options, min=min, max=max, **kwargs)
+
+    def default_render_options(self):
+        colors = {'STOCH_K': (100, 100, 255), 'STOCH_D': (255, 165, 0)}
+        options = {name: RenderOptions(
+            name=name,
+            color=colors[name],
+            window_type=WindowType.SEPERATE,
+            render_type=RenderType.LINE,
+            min=self.min,
+            max=self.max
+        ) for name in self._names}
+
+        for name, value in {"STOCH20": 20, "STOCH80": 80}.items():
+            options[name] = RenderOptions(
+                name=name,
+                color=(192, 192, 192),
+                window_type=WindowType.SEPERATE,
+                render_type=RenderType.LINE,
+                min=self.min,
+                max=self.max,
+                value=value
+            )
+        return options
+
+    @property
+    def warmup(self) -> int:
+        return self._k_period + self._d_period - 2
+
+    def compute(self):
+        lowest_low = self._store.rolling_min('low', self._k_period)
+        highest_high = self._store.rolling_max('high', self._k_period)
+        stoch_k = 100 * (self._store[self.target_column] - lowest_low) / (highest_high - lowest_low)
+        self._outputs['STOCH_K'] = stoch_k
+        self._outputs['STOCH_D'] = stoch_k.rolling(self._d_period).mean()
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        self._online = {
+            'high': deque(maxlen=self._k_period), 
+            'low': deque(maxlen=self._k_period), 
+            'stoch_k': deque(maxlen=self._d_period)
+        }
+        columns = list(dict.fromkeys(['high', 'low', self.target_column]))
+        for candle in history[columns].iloc[-self.warmup:].to_dict('records') if self.warmup else []:
+            self.update(candle)
+
+    def update(self, candle: dict) -> list:
+        state = self._online
+        state['high'].append(candle['high'])
+        state['low'].append(candle['low'])
+
+        stoch_k = np.nan
+        if len(state['high']) == self._k_period:
+            lowest_low, highest_high = min(state['low']), max(state['high'])
+            # flat range has close equal to lowest low, 0 / 0 is nan as in compute
+            if highest_high != lowest_low:
+                stoch_k = 100 * (candle[self.target_column] - lowest_low) / (highest_high - lowest_low)
+        state['stoch_k'].append(stoch_k)
+
+        stoch_d = sum(state['stoch_k']) / self._d_period if len(state['stoch_k']) == self._d_period else np.nan
+
+        return [stoch_k, stoch_d]
+
+    def config(self):
+        config = super().config()
+        config['k_period'] = self._k_period
+        config['d_period'] = self._d_period
+        return config
+
+
+def _rolling_mean_abs_deviation(values: np.ndarray, means: np.ndarray, period: int, chunk_size: int=1 << 16) -> np.ndarray:
+    """ Mean absolute deviation of each window of period rows from its mean, windows are processed in chunks of 
+    rows as (chunk_size, period) views, so memory doesn't grow with period * rows
+    """
+    deviation = np.full(values.shape, np.nan)
+    if len(values) < period:
+        return deviation
+
+    windows = sliding_window_view(values, period, axis=0)
+    for start in range(0, len(windows), chunk_size):
+        stop = min(start + chunk_size, len(windows))
+        window_means = means[start + period - 1:stop + period - 1]
+        deviation[start + period - 1:stop + period - 1] = np.abs(windows[start:stop] - window_means[..., None]).mean(axis=-1)
+
+    return deviation
+
+
+class CCI(Indicator):
+    """ Momentum indicator
+
+    The commodity channel index (CCI), developed by Donald Lambert, measures difference between typical price 
+    ((high + low + close) / 3) and its simple moving average, relative to mean absolute deviation of typical price 
+    over period. Values above 100 are considered overbought and below -100 oversold.
+
+    https://www.investopedia.com/terms/c/commoditychannelindex.asp
+    """
+    def __init__(
+            self, 
+            data: pd.DataFrame, 
+            period: int=20, 
+            constant: float=0.015,
+            target_column: str='close',
+            render_options: dict={},
+            **kwargs
+        ):
+        self._period = period
+        self._constant = constant
+        self._names = ['CCI']
+        super().__init__(data, target_column, render_options, **kwargs)
+        if self._store is not None:
+            self.min = np.nanmin(self._outputs['CCI'])
+            self.max = np.nanmax(self._outputs['CCI'])
+
+    def default_render_options(self):
+        options = {name: RenderOptions(
+            name=name,
+            color=(100, 100, 255),
+            window_type=WindowType.SEPERATE,
+            render_type=RenderType.LINE,
+            min=self.min,
+            max=self.max
+        ) for name in self._names}
+
+        for name, value in {"CCI-100": -100, "CCI100": 100}.items():
+            options[name] = RenderOptions(
+                name=name,
+                color=(192, 192, 192),
+                window_type=WindowType.SEPERATE,
+                render_type=RenderType.LINE,
+                min=self.min,
+                max=self.max,
+                value=value
+            )
+        return options
+
+    @property
+    def warmup(self) -> int:
+        return self._period - 1
+
+    def compute(self):
+        typical_price = self._store.cached(('typical_price',), lambda: (self._store['high'] + self._store['low'] + self._store['close']) / 3)
+        sma = self._store.rolling_mean(('typical_price',), self._period)
+        deviation = _rolling_mean_abs_deviation(typical_price.to_numpy(dtype=np.float64), sma.to_numpy(dtype=np.float64), self._period)
+        self._outputs['CCI'] = (typical_price - sma) / (self._constant * _like(deviation, typical_price))
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        self._online = deque(maxlen=self._period)
+        for candle in history[['high', 'low', 'close']].iloc[-self._period:].to_dict('records'):
+            self.update(candle)
+
+    def update(self, candle: dict) -> list:
+        typical_price = (candle['high'] + candle['low'] + candle['close']) / 3
+        self._online.append(typical_price)
+        if len(self._online) < self._period:
+            return [np.nan]
+
+        sma = sum(self._online) / self._period
+        deviation = sum(abs(value - sma) for value in self._online) / self._period
+        # flat window has typical price equal to its mean, 0 / 0 is nan as in compute
+        return [(typical_price - sma) / (self._constant * deviation) if deviation != 0 else np.nan]
+
+    def config(self):
+        config = super().config()
+        config['period'] = self._period
+        config['constant'] = self._constant
+        return config
+
+
+def _like(values: np.ndarray, template: typing.Union[pd.Series, pd.DataFrame]) -> typing.Union[pd.Series, pd.DataFrame]:
+    """ Wrap computed array into Series or DataFrame (panel of assets) with index of template
+    """
+    if isinstance(template, pd.DataFrame):
+        return pd.DataFrame(values, index=template.index, columns=template.columns, copy=False)
+    return pd.Series(values, index=template.index, copy=False)
+
+
+def _ema_loop(values, alphas, out):
+    """ Stacked EMA recursions out[k, i] = (1 - alphas[k]) * out[k, i - 1] + alphas[k] * values[i], that start from 
+    the first valid value (same as pandas ewm with adjust=False), each recursion fills contiguous row of out
+
+    NaN values keep the previous average and the weight of the previous average keeps decaying over the gap, 
+    same as pandas ewm with ignore_na=False.
+    """
+    for k in range(len(alphas)):
+        alpha = alphas[k]
+        previous = np.nan
+        weight = 1.0
+        for i in range(len(values)):
+            value = values[i]
+            weight *= 1 - alpha
+            if not np.isnan(value):
+                if np.isnan(previous):
+                    previous = value
+                else:
+                    previous = (weight * previous + alpha * value) / (weight + alpha)
+                weight = 1.0
+            out[k, i] = previous
+
+
+def _decayed_sum_loop(values, decays, out):
+    """ Stacked decayed sums out[k, i] = decays[k] * out[k, i - 1] + values[i], that start from zero, NaN values 
+    add nothing and the sum only decays over them (same weights as pandas ewm with ignore_na=False)
+    """
+    for k in range(len(decays)):
+        decay = decays[k]
+        previous = 0.0
+        for i in range(len(values)):
+            previous *= decay
+            if not np.isnan(values[i]):
+                previous += values[i]
+            out[k, i] = previous
+
+
+_ema_compiled = njit(cache=True, nogil=True)(_ema_loop) if njit is not None else None
+_decayed_sum_compiled = njit(cache=True, nogil=True)(_decayed_sum_loop) if njit is not None else None
+
+
+class IndicatorSweep(Indicator):
+    """ Base class for family of indicators at many periods computed in one pass
+
+    Each period is one column of the indicator (names ordered as periods), so the whole family is served as one 
+    (len(data), len(periods)) feature block by to_numpy, data feeders and scalers.
+    """
+    _prefix = ''
+
+    def __init__(
+            self, 
+            data: pd.DataFrame, 
+            periods: list=list(range(5, 201, 5)),
+            target_column: str='close',
+            render_options: dict={},
+            **kwargs
+        ):
+        assert len(periods) > 0 and all(int(period) >= 1 for period in periods), "periods must be a list of positive integers"
+        self._periods = [int(period) for period in periods]
+        self._names = [f'{self._prefix}{period}' for period in self._periods]
+        super().__init__(data, target_column, render_options, **kwargs)
+
+    @property
+    def periods(self) -> list:
+        return self._periods
+
+    def _set_outputs(self, values: np.ndarray, template: typing.Union[pd.Series, pd.DataFrame]) -> None:
+        """ Store (periods, time, [assets]) block as outputs, each period is contiguous row of the block
+        """
+        for i, name in enumerate(self._names):
+            self._outputs[name] = _like(values[i], template)
+
+    def _set_bounds(self) -> None:
+        if self._store is not None:
+            self.min = min(np.nanmin(self._outputs[name]) for name in self._names)
+            self.max = max(np.nanmax(self._outputs[name]) for name in self._names)
+
+    def default_render_options(self):
+        return {name: RenderOptions(
+            name=name,
+            color=(100, 100, 255),
+            window_type=WindowType.MAIN,
+            render_type=RenderType.LINE,
+            min=self.min,
+            max=self.max
+        ) for name in self._names}
+
+    def config(self):
+        config = super().config()
+        config['periods'] = self._periods
+        return config
+
+
+class SMASweep(IndicatorSweep):
+    """ Simple moving averages of many periods
+
+    All periods are differences of one cumulative sum of prices, so adding a period costs one vector subtraction 
+    instead of another rolling scan. Prices are centered on their first value before summing to keep precision, NaN 
+    prices are summed as zeros and windows that contain them are NaN (same as SMA indicator).
+    """
+    _prefix = 'SMA'
+
+    def __init__(self, data: pd.DataFrame, periods: list=list(range(5, 201, 5)), **kwargs):
+        super().__init__(data, periods, **kwargs)
+        self._set_bounds()
+
+    @property
+    def warmup(self) -> int:
+        return max(self._periods) - 1
+
+    def compute(self):
+        prices = self._store[self.target_column]
+        values = prices.to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        # first valid value of each column, columns without any valid value are not shifted
+        shift = np.nan_to_num(np.take_along_axis(values, valid.argmax(axis=0)[None], axis=0))
+        cumsum = np.zeros((len(values) + 1,) + values.shape[1:])
+        np.cumsum(np.where(valid, values - shift, 0.0), axis=0, out=cumsum[1:])
+        counts = np.zeros((len(values) + 1,) + values.shape[1:], dtype=np.int64)
+        np.cumsum(valid, axis=0, out=counts[1:])
+
+        block = np.full((len(self._periods),) + values.shape, np.nan)
+        for i, period in enumerate(self._periods):
+            if period <= len(values):
+                np.subtract(cumsum[period:], cumsum[:-period], out=block[i, period - 1:])
+                block[i, period - 1:] /= period
+                block[i, period - 1:] += shift
+                # same as pandas rolling mean, windows with any NaN value are NaN
+                block[i, period - 1:][counts[period:] - counts[:-period] < period] = np.nan
+
+        self._set_outputs(block, prices)
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        values = history[self.target_column].tolist()
+        self._online = [RollingWindow(period, values[-period:]) for period in self._periods]
+
+    def update(self, candle: dict) -> list:
+        value = candle[self.target_column]
+        results = []
+        for window in self._online:
+            window.append(value)
+            results.append(window.mean() if window.full else np.nan)
+        return results
+
+
+class EMASweep(IndicatorSweep):
+    """ Exponential moving averages (pandas ewm with span=period and adjust=False) of many periods
+
+    EMA recursions of all periods are stacked and advanced together in one pass over prices, compiled with numba 
+    when it's installed. Without numba each period is computed with pandas ewm through the shared FeatureStore.
+    """
+    _prefix = 'EMA'
+
+    def __init__(self, data: pd.DataFrame, periods: list=list(range(5, 201, 5)), **kwargs):
+        super().__init__(data, periods, **kwargs)
+        self._set_bounds()
+
+    @property
+    def warmup(self) -> int:
+        # same as MACD, weight of older rows falls below float precision
+        return 20 * (max(self._periods) + 1)
+
+    @property
+    def _alphas(self) -> np.ndarray:
+        return 2 / (np.array(self._periods, dtype=np.float64) + 1)
+
+    def compute(self):
+        prices = self._store[self.target_column]
+        if _ema_compiled is None:
+            for name, period in zip(self._names, self._periods):
+                self._outputs[name] = self._store.ewm_mean(self.target_column, span=period, adjust=False)
+            return
+
+        values = prices.to_numpy(dtype=np.float64)
+        columns = values.reshape(len(values), -1)
+        block = np.empty((len(self._periods),) + columns.shape)
+        for j in range(columns.shape[1]):
+            _ema_compiled(np.ascontiguousarray(columns[:, j]), self._alphas, block[:, :, j])
+
+        self._set_outputs(block.reshape((len(self._periods),) + values.shape), prices)
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        self._online = None
+        for close in history[self.target_column].iloc[-(self.warmup + 1):].tolist():
+            self.update({self.target_column: close})
+
+    def update(self, candle: dict) -> list:
+        value = candle[self.target_column]
+        if self._online is None:
+            self._online = np.full(len(self._periods), value, dtype=np.float64)
+        else:
+            alphas = self._alphas
+            self._online = (1 - alphas) * self._online + alphas * value
+        return self._online.tolist()
+
+
+class RSISweep(IndicatorSweep):
+    """ Relative Strength Index (same as RSI indicator) of many periods
+
+    Gains and losses are FeatureStore intermediates, so they are computed once for the sweep and RSI indicators on 
+    the same store. Wilder smoothed gains and losses of all periods are advanced together in one pass over price 
+    changes, compiled with numba when it's installed (pip install finrock[fast]). Without numba smoothed gains and 
+    losses of each period are pandas ewm means requested from the store, that RSI of the same period reuses.
+    """
+    _prefix = 'RSI'
+
+    def __init__(
+            self, 
+            data: pd.DataFrame, 
+            periods: list=list(range(5, 201, 5)), 
+            min: float=0.0,
+            max: float=100.0,
+            **kwargs
+        ):
+        super().__init__(data, periods, min=min, max=max, **kwargs)
+
+    @property
+    def warmup(self) -> int:
+        return 40 * max(self._periods)
+
+    def compute(self):
+        delta = self._store.diff(self.target_column)
+        gain = self._store.cached(('gain', self.target_column), lambda: delta.clip(lower=0))
+        loss = self._store.cached(('loss', self.target_column), lambda: -1 * delta.clip(upper=0))
+
+        if _decayed_sum_compiled is None:
+            for name, period in zip(self._names, self._periods):
+                ema_up = self._store.ewm_mean(('gain', self.target_column), com=period-1, adjust=True, min_periods=period)
+                ema_down = self._store.ewm_mean(('loss', self.target_column), com=period-1, adjust=True, min_periods=period)
+                self._outputs[name] = 100 - (100 / (1 + ema_up / ema_down))
+            return
+
+        # adjusted ewm is ratio of decayed sums, their common denominator cancels out in ema_up / ema_down
+        decays = 1 - 1 / np.array(self._periods, dtype=np.float64)
+        gains = gain.to_numpy(dtype=np.float64).reshape(len(gain), -1)
+        losses = loss.to_numpy(dtype=np.float64).reshape(len(loss), -1)
+        block = np.empty((len(self._periods),) + gains.shape)
+        up = np.empty((len(self._periods), len(gains)))
+        down = np.empty_like(up)
+        for j in range(gains.shape[1]):
+            _decayed_sum_compiled(np.ascontiguousarray(gains[:, j]), decays, up)
+            _decayed_sum_compiled(np.ascontiguousarray(losses[:, j]), decays, down)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                block[:, :, j] = 100 - (100 / (1 + up / down))
+
+        # rows with less than period price changes so far (same as min_periods of ewm, that counts valid values)
+        counts = np.cumsum(~np.isnan(gains), axis=0)
+        for i, period in enumerate(self._periods):
+            block[i][counts < period] = np.nan
+
+        self._set_outputs(block.reshape((len(self._periods),) + gain.shape), gain)
+
+    def warm_start(self, history: pd.DataFrame) -> None:
+        self._online = {'close': np.nan, 'up': np.zeros(len(self._periods)), 'down': np.zeros(len(self._periods)), 'count': 0}
+        for close in history[self.target_column].iloc[-(self.warmup + 1):].tolist():
+            self.update({self.target_column: close})
+
+    def update(self, candle: dict) -> list:
+        state = self._online
+        close = candle[self.target_column]
+        delta, state['close'] = close - state['close'], close
+        if np.isnan(delta):
+            return [np.nan] * len(self._periods)
+
+        decays = 1 - 1 / np.array(self._periods, dtype=np.float64)
+        state['up'] = state['up'] * decays + max(delta, 0.0)
+        state['down'] = state['down'] * decays + max(-delta, 0.0)
+        state['count'] += 1
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - (100 / (1 + state['up'] / state['down']))
+        rsi[state['count'] < np.array(self._periods)] = np.nan
+
+        return rsi.tolist()
+
+    def default_render_options(self):
+        return {name: RenderOptions(
+            name=name,
+            color=(100, 100, 255),
+            window_type=WindowType.SEPERATE,
+            render_type=RenderType.LINE,
+            min=self.min,
+            max=self.max
+        ) for name in self._names}
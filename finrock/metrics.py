@@ -28,8 +28,11 @@ class Metric:
     def __name__(self) -> str:
         return self.__class__.__name__
 
-    def update(self, state: State):
-        assert isinstance(state, State), f'state must be State, received: {type(state)}'
+    def update(self, state: State, validate: bool=True):
+        """ Update metric with state of new step, validate=False skips type check (TradingEnv in 'fast' validation mode)
+        """
+        if validate:
+            assert isinstance(state, State), f'state must be State, received: {type(state)}'
 
         return state
 
@@ -47,8 +50,8 @@ class DifferentActions(Metric):
     def __init__(self, name: str="different_actions") -> None:
         super().__init__(name=name)
 
-    def update(self, state: State):
-        super().update(state)
+    def update(self, state: State, validate: bool=True):
+        super().update(state, validate)
 
         if not self.prev_state:
             self.prev_state = state
@@ -73,8 +76,8 @@ class AccountValue(Metric):
     def __init__(self, name: str="account_value") -> None:
         super().__init__(name=name)
 
-    def update(self, state: State):
-        super().update(state)
+    def update(self, state: State, validate: bool=True):
+        super().update(state, validate)
 
         self.account_value = state.account_value
 
@@ -100,8 +103,8 @@ class MaxDrawdown(Metric):
     def __init__(self, name: str="max_drawdown") -> None:
         super().__init__(name=name)
 
-    def update(self, state: State):
-        super().update(state)
+    def update(self, state: State, validate: bool=True):
+        super().update(state, validate)
 
         # Use min to find the trough value
         self.max_account_value = max(self.max_account_value, state.account_value)
@@ -135,9 +138,9 @@ class SharpeRatio(Metric):
         self.ratio_days = ratio_days
         super().__init__(name=name)
 
-    def update(self, state: State):
-        super().update(state)
-        time_difference_days = (state.date - self.prev_state.date).days
+    def update(self, state: State, validate: bool=True):
+        super().update(state, validate)
+        time_difference_days = (state.epoch - self.prev_state.epoch) // 86400
         if time_difference_days >= 1:
             self.daily_returns.append((state.account_value - self.prev_state.account_value) / self.prev_state.account_value)
             self.prev_state = state
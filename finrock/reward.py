@@ -9,7 +9,9 @@ class Reward:
     def __name__(self) -> str:
         return self.__class__.__name__
     
-    def __call__(self, observations: Observations) -> float:
+    def __call__(self, observations: Observations, validate: bool=True) -> float:
+        """ Reward of the last step, validate=False skips type check (TradingEnv in 'fast' validation mode)
+        """
         raise NotImplementedError
     
     def reset(self, observations: Observations):
@@ -20,8 +22,9 @@ class SimpleReward(Reward):
     def __init__(self) -> None:
         super().__init__()
 
-    def __call__(self, observations: Observations) -> float:
-        assert isinstance(observations, Observations) == True, "observations must be an instance of Observations"
+    def __call__(self, observations: Observations, validate: bool=True) -> float:
+        if validate:
+            assert isinstance(observations, Observations) == True, "observations must be an instance of Observations"
 
         last_state, next_state = observations[-2:]
 
@@ -58,8 +61,9 @@ class AccountValueChangeReward(Reward):
         super().reset(observations)
         self.returns = []
     
-    def __call__(self, observations: Observations) -> float:
-        assert isinstance(observations, Observations) == True, "observations must be an instance of Observations"
+    def __call__(self, observations: Observations, validate: bool=True) -> float:
+        if validate:
+            assert isinstance(observations, Observations) == True, "observations must be an instance of Observations"
 
         last_state, next_state = observations[-2:]
         reward = (next_state.account_value - last_state.account_value) / last_state.account_value
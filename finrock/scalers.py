@@ -1,19 +1,117 @@
 import numpy as np
 np.seterr(all="ignore")
 import warnings
+from numpy.lib.stride_tricks import sliding_window_view
 from .state import Observations
 
 
 class Scaler:
-    def __init__(self):
-        pass
+    """ Base class for scalers, that transform observations window into model input
+
+    dtype is dtype of precomputed features and of returned observations (e.g. np.float32 halves their memory and 
+    needs no conversion for models). Observations window is gathered into preallocated feature block and transform 
+    methods write results into out, when preallocated output buffer is given.
+    """
+    def __init__(self, dtype: np.dtype=np.float64):
+        self._windows = None
+        self._dtype = np.dtype(dtype)
+        self._block = None
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    def _observation_block(self, observations: Observations) -> np.ndarray:
+        """ Preallocated block of open, high, low, close, allocation_percentage and indicator values of window rows
+        """
+        indicator_values = observations.indicator_values
+        shape = (len(observations), 5 + indicator_values.shape[-1])
+        if self._block is None or self._block.shape != shape:
+            self._block = np.empty(shape, dtype=self._dtype)
+
+        block = self._block
+        for column, values in enumerate([observations.open, observations.high, observations.low, observations.close, observations.allocation_percentage]):
+            block[:, column] = values
+        block[:, 5:] = indicator_values
+
+        return block
+
+    def _output(self, shape: tuple, out: np.ndarray=None) -> np.ndarray:
+        if out is None:
+            return np.empty(shape, dtype=self._dtype)
+        assert out.shape == shape, f"out must have shape {shape}, received: {out.shape}"
+        return out
     
-    def transform(self, observations: Observations) -> np.ndarray:
+    def transform(self, observations: Observations, out: np.ndarray=None) -> np.ndarray:
+        raise NotImplementedError
+
+    def features(self, data_feeder) -> np.ndarray:
+        """ Market part of observation features for every row of array-backed data feeder, shape (len, features) 
+        or (len, assets, features) for PanelDataFeeder, with columns ordered as in transform (allocation_percentage 
+        column is left empty)
+        """
+        raise NotImplementedError
+
+    def precompute(self, data_feeder, window_size: int) -> None:
+        """ Compute market features once for whole dataset, so transform_window serves windows as views
+        """
+        assert hasattr(data_feeder, "ohlcv") and len(data_feeder.ohlcv) == len(data_feeder), \
+            "precompute requires data feeder that holds whole dataset in arrays (e.g. NumpyDataFeeder)"
+        self._window_size = window_size
+        self._features = self.features(data_feeder)
+        self._windows = sliding_window_view(self._features, window_size, axis=0)
+        # window axis is appended last by sliding_window_view, it's moved back to front when window is served
+        self._window_axes = (self._windows.ndim - 2,) + tuple(range(self._windows.ndim - 2))
+
+    def window(self, index: int) -> np.ndarray:
+        """ Zero-copy view of precomputed features for window of rows ending at index, shape (window_size, ...features)
+        """
+        assert self._windows is not None, "precompute must be called before transform_window"
+        return self._windows[index - self._window_size + 1].transpose(self._window_axes)
+
+    def windows(self, indices: np.ndarray, start: int=0, out: np.ndarray=None) -> np.ndarray:
+        """ Copy of precomputed features for windows of rows ending at each of indices, gathered with one 
+        fancy-indexing call, shape (len(indices), window_size - start, ...features), start skips oldest rows of windows
+        """
+        assert self._windows is not None, "precompute must be called before transform_windows"
+        rows = np.asarray(indices)[:, None] + np.arange(start - self._window_size + 1, 1)
+        return np.take(self._features, rows, axis=0, out=out)
+
+    def transform_window(self, index: int, allocation_percentage: np.ndarray, out: np.ndarray=None) -> np.ndarray:
+        """ Same as transform, for window of rows ending at index and account allocation_percentage of these rows
+        """
         raise NotImplementedError
+
+    def transform_windows(self, indices: np.ndarray, allocation_percentage: np.ndarray, out: np.ndarray=None) -> np.ndarray:
+        """ Batched transform_window for windows ending at each of indices, allocation_percentage has shape 
+        (len(indices), window_size, ...), observations are stacked along first axis
+        """
+        observations = [self.transform_window(index, allocation) for index, allocation in zip(indices, allocation_percentage)]
+        results = self._output((len(observations),) + observations[0].shape, out)
+        for i, observation in enumerate(observations):
+            results[i] = observation
+
+        return results
+
+    def fit(self, data_feeder) -> "Scaler":
+        """ Compute statistics of features over whole dataset of array-backed data feeder, scalers without fitted 
+        statistics don't need it
+        """
+        return self
+
+    def config(self) -> dict:
+        """ Constructor arguments (including fitted statistics), saved with environment config
+        """
+        return {"dtype": self._dtype.name}
+
+    @classmethod
+    def from_config(cls, config: dict) -> "Scaler":
+        return cls(**config)
     
-    def __call__(self, observations) -> np.ndarray:
-        assert isinstance(observations, Observations) == True, "observations must be an instance of Observations"
-        return self.transform(observations)
+    def __call__(self, observations, out: np.ndarray=None, validate: bool=True) -> np.ndarray:
+        if validate:
+            assert isinstance(observations, Observations) == True, "observations must be an instance of Observations"
+        return self.transform(observations, out=out)
     
     @property
     def __name__(self) -> str:
@@ -25,52 +123,387 @@ class Scaler:
 
 
 class MinMaxScaler(Scaler):
-    def __init__(self, min: float, max: float):
-        super().__init__()
+    def __init__(self, min: float, max: float, dtype: np.dtype=np.float64):
+        super().__init__(dtype)
         self._min = min
         self._max = max
+
+    def config(self) -> dict:
+        return {"min": float(self._min), "max": float(self._max), **super().config()}
+
+    def features(self, data_feeder) -> np.ndarray:
+        ohlcv = data_feeder.ohlcv
+        features = np.zeros(ohlcv.shape[:-1] + (5 + data_feeder.indicator_values.shape[-1],), dtype=self._dtype)
+        features[..., :4] = (ohlcv[..., :4] - self._min) / (self._max - self._min)
+
+        for indicator, indicator_slice in zip(data_feeder.indicators, data_feeder.indicator_slices):
+            values = data_feeder.indicator_values[..., indicator_slice]
+            features[..., 5 + indicator_slice.start:5 + indicator_slice.stop] = (values - indicator.min) / (indicator.max - indicator.min)
+
+        return features
+
+    def transform_window(self, index: int, allocation_percentage: np.ndarray, out: np.ndarray=None) -> np.ndarray:
+        # one copy, so returned observation doesn't alias precomputed features
+        window = self.window(index)
+        results = self._output(window.shape, out)
+        results[...] = window
+        results[..., 4] = allocation_percentage
+
+        return results
+
+    def transform_windows(self, indices: np.ndarray, allocation_percentage: np.ndarray, out: np.ndarray=None) -> np.ndarray:
+        results = self.windows(indices, out=out)
+        results[..., 4] = allocation_percentage
+
+        return results
     
-    def transform(self, observations: Observations) -> np.ndarray:
-        transformed_data = []
-        for state in observations:
-            data = []
-            for name in ['open', 'high', 'low', 'close']:
-                value = getattr(state, name)
-                transformed_value = (value - self._min) / (self._max - self._min)
-                data.append(transformed_value)
-            
-            data.append(state.allocation_percentage)
-
-            # append scaled indicators
-            for indicator in state.indicators:
-                for value in indicator["values"].values():
-                    transformed_value = (value - indicator["min"]) / (indicator["max"] - indicator["min"])
-                    data.append(transformed_value)
-
-            transformed_data.append(data)
-
-        results = np.array(transformed_data)
+    def transform(self, observations: Observations, out: np.ndarray=None) -> np.ndarray:
+        indicator_min, indicator_max = observations[-1].indicator_bounds
+        block = self._observation_block(observations)
+        results = self._output(block.shape, out)
+
+        np.subtract(block[:, :4], self._min, out=results[:, :4])
+        results[:, :4] /= self._max - self._min
+        results[:, 4] = block[:, 4]
+        np.subtract(block[:, 5:], indicator_min, out=results[:, 5:])
+        results[:, 5:] /= indicator_max - indicator_min
 
         return results
     
 
 class ZScoreScaler(Scaler):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, dtype: np.dtype=np.float64):
+        super().__init__(dtype)
         warnings.filterwarnings("ignore", category=RuntimeWarning, message="overflow encountered in reduce")
-    
-    def transform(self, observations: Observations) -> np.ndarray:
-        full_data = []
-        for state in observations:
-            data = [getattr(state, name) for name in ['open', 'high', 'low', 'close', 'allocation_percentage']]
-            data += [value for indicator in state.indicators for value in indicator["values"].values()]
-            full_data.append(data)
 
-        results = np.array(full_data)
+    def features(self, data_feeder) -> np.ndarray:
+        """ Returns of every row relative to previous row, first row has no previous row and is nan
+        """
+        ohlcv = data_feeder.ohlcv
+        data = np.zeros(ohlcv.shape[:-1] + (5 + data_feeder.indicator_values.shape[-1],), dtype=self._dtype)
+        data[..., :4] = ohlcv[..., :4]
+        data[..., 5:] = data_feeder.indicator_values
+
+        features = np.full(data.shape, np.nan, dtype=self._dtype)
+        features[1:] = np.nan_to_num(np.diff(data, axis=0) / data[:-1])
+
+        return features
+
+    def precompute(self, data_feeder, window_size: int, chunk_size: int=1 << 12) -> None:
+        """ Also compute mean and std of market features of every window once (windows are reduced in chunks of rows 
+        to bound memory), so transform_window only computes statistics of allocation_percentage
+        """
+        super().precompute(data_feeder, window_size)
+        # first row of window is left out, its return refers to row outside of window
+        returns = sliding_window_view(self._features[1:], window_size - 1, axis=0)
+        self._means = np.empty(returns.shape[:-1], dtype=self._dtype)
+        self._stds = np.empty(returns.shape[:-1], dtype=self._dtype)
+        for start in range(0, len(returns), chunk_size):
+            chunk = returns[start:start + chunk_size]
+            np.mean(chunk, axis=-1, out=self._means[start:start + chunk_size])
+            np.std(chunk, axis=-1, out=self._stds[start:start + chunk_size])
+
+        # constant features have zero z-scores, same as nan_to_num of 0 / 0 in transform
+        self._stds[self._stds == 0] = np.inf
+
+    @staticmethod
+    def _allocation_z_scores(allocation_percentage: np.ndarray) -> np.ndarray:
+        """ Z-scores of allocation_percentage returns along first (window) axis, same operations as np.mean and np.std
+        """
+        returns = (allocation_percentage[1:] - allocation_percentage[:-1]) / allocation_percentage[:-1]
+        returns[np.isnan(returns)] = 0.0
+        centered = returns - returns.sum(axis=0) / len(returns)
+        std = np.sqrt((centered * centered).sum(axis=0) / len(returns))
+        # allocation from zero has infinite return, nan_to_num in transform makes z-scores of its window zero too
+        return np.divide(centered, std, out=np.zeros_like(centered), where=(std > 0) & (std < np.inf))
+
+    def transform_window(self, index: int, allocation_percentage: np.ndarray, out: np.ndarray=None) -> np.ndarray:
+        # returns of window rows and their statistics are precomputed, except allocation_percentage of account
+        start = index - self._window_size + 1
+        returns = self.window(index)[1:]
+
+        z_scores = self._output(returns.shape, out)
+        np.subtract(returns, self._means[start], out=z_scores)
+        np.divide(z_scores, self._stds[start], out=z_scores)
+        z_scores[..., 4] = self._allocation_z_scores(allocation_percentage)
+
+        return z_scores
+
+    def transform_windows(self, indices: np.ndarray, allocation_percentage: np.ndarray, out: np.ndarray=None) -> np.ndarray:
+        # same as transform_window, with windows stacked along first axis and statistics gathered for each window
+        starts = np.asarray(indices) - self._window_size + 1
+        z_scores = self.windows(indices, start=1, out=out)
+        z_scores -= self._means[starts][:, None]
+        z_scores /= self._stds[starts][:, None]
+        z_scores[..., 4] = np.swapaxes(self._allocation_z_scores(np.swapaxes(allocation_percentage, 0, 1)), 0, 1)
+
+        return z_scores
+    
+    def transform(self, observations: Observations, out: np.ndarray=None) -> np.ndarray:
+        results = self._observation_block(observations)
 
         # nan to zero, when divided by zero and allocation_percentage is not changed
         returns = np.nan_to_num(np.diff(results, axis=0) / results[:-1])
 
-        z_scores = np.nan_to_num((returns - np.mean(returns, axis=0)) / np.std(returns, axis=0))
+        z_scores = self._output(returns.shape, out)
+        z_scores[...] = np.nan_to_num((returns - np.mean(returns, axis=0)) / np.std(returns, axis=0))
+
+        return z_scores
+
+
+class IncrementalZScoreScaler(ZScoreScaler):
+    """ ZScoreScaler, that updates returns of observations window incrementally
+
+    Returns of window rows are kept in circular buffer with running sums and sums of squares per feature, so each 
+    step computes return of one new row and updates mean and std in O(features) instead of rebuilding the window. 
+    Sums are kept relative to shift, that is re-centered on window mean every resync_every steps (window size by 
+    default), so float error doesn't accumulate. Allocation percentage of two newest rows is read again on every 
+    call, because environment fills it after state is appended.
+
+    Output is the same as ZScoreScaler within float tolerance. Window is rebuilt when observations don't continue 
+    from previous call (observations were reset, other observations object or more than one state was appended).
+    """
+    def __init__(self, resync_every: int=None, dtype: np.dtype=np.float64):
+        super().__init__(dtype)
+        self._resync_every = resync_every
+        self._appends = None
+        self._newest_state = None
+
+    def config(self) -> dict:
+        return {"resync_every": self._resync_every, **super().config()}
+
+    @staticmethod
+    def _market_row(state) -> np.ndarray:
+        """ Features of state in ZScoreScaler order, allocation_percentage is filled separately
+        """
+        return np.concatenate([[state.open, state.high, state.low, state.close, np.nan], state.indicator_values])
+
+    @staticmethod
+    def _returns(row: np.ndarray, previous_row: np.ndarray) -> np.ndarray:
+        # nan to zero, when divided by zero and value is not changed, infinite returns are counted separately
+        returns = (row - previous_row) / previous_row
+        returns[np.isnan(returns)] = 0.0
+        return returns
+
+    def _reset(self, observations: Observations) -> None:
+        """ Rebuild returns buffer and sums from whole observations window
+        """
+        rows = np.array([self._market_row(state) for state in observations])
+        rows[:, 4] = observations.allocation_percentage
+
+        self._size = observations.window_size - 1
+        self._buffer = np.zeros((2 * self._size, rows.shape[1]))
+        self._position = self._size - 1
+        self._length = 0
+        self._last_row = rows[-1]
+        returns = self._returns(rows[1:], rows[:-1])
+        for row in returns:
+            self._write(row)
+        self._resync()
+
+    def _write(self, row: np.ndarray) -> None:
+        self._position = (self._position + 1) % self._size
+        self._length = min(self._length + 1, self._size)
+        self._buffer[self._position] = self._buffer[self._position + self._size] = row
+
+    @property
+    def _window(self) -> np.ndarray:
+        end = self._position + self._size + 1
+        return self._buffer[end - self._length:end]
+
+    def _resync(self) -> None:
+        """ Recompute sums exactly, relative to mean of finite window returns
+        """
+        window = self._window
+        finite = np.isfinite(window)
+        self._infinite = np.sum(~finite, axis=0)
+        # infinite returns have zero deviation, same as when they are added or removed by _add
+        finite_count = np.sum(finite, axis=0)
+        self._shift = np.sum(np.where(finite, window, 0.0), axis=0) / np.maximum(finite_count, 1)
+        deviation = np.where(finite, window - self._shift, 0.0)
+        self._sum = np.sum(deviation, axis=0)
+        self._sumsq = np.sum(deviation ** 2, axis=0)
+        self._max_deviation = np.max(np.abs(deviation), axis=0, initial=0.0)
+        self._updates = 0
+
+    def _add(self, row: np.ndarray, sign: float) -> None:
+        """ Add (sign=1) or remove (sign=-1) returns row from sums
+        """
+        finite = np.isfinite(row)
+        self._infinite += np.where(finite, 0, int(sign))
+        deviation = np.where(finite, row, self._shift) - self._shift
+        self._sum += sign * deviation
+        self._sumsq += sign * deviation * deviation
+        np.maximum(self._max_deviation, np.abs(deviation), out=self._max_deviation)
+
+    def _push(self, observations: Observations) -> None:
+        """ Add returns of newest state, oldest returns leave the window when it's full
+        """
+        row = self._market_row(observations[-1])
+        row[4] = self._last_row[4]
+        returns = self._returns(row, self._last_row)
+        if self._length == self._size:
+            self._add(self._window[0], -1.0)
+        self._write(returns)
+        self._add(returns, 1.0)
+        self._last_row = row
+
+        self._updates += 1
+        if self._updates >= (self._resync_every or self._size):
+            self._resync()
+
+    def _refresh_allocation_percentage(self, observations: Observations) -> None:
+        """ Recompute allocation_percentage returns of two newest rows from current account values
+        """
+        allocation_percentage = observations.allocation_percentage[-3:]
+        self._last_row[4] = allocation_percentage[-1]
+        if not self._length:
+            return
+
+        returns = self._returns(allocation_percentage[1:], allocation_percentage[:-1])[-self._length:]
+        window = self._window
+        for offset, value in zip(range(-len(returns), 0), returns):
+            previous = window[offset, 4]
+            if previous == value:
+                continue
+            self._add_value(previous, -1.0)
+            self._add_value(value, 1.0)
+            position = (self._position + offset + 1) % self._size
+            self._buffer[position, 4] = self._buffer[position + self._size, 4] = value
+
+    def _add_value(self, value: float, sign: float) -> None:
+        if not np.isfinite(value):
+            self._infinite[4] += int(sign)
+            return
+        deviation = value - self._shift[4]
+        self._sum[4] += sign * deviation
+        self._sumsq[4] += sign * deviation * deviation
+        self._max_deviation[4] = max(self._max_deviation[4], abs(deviation))
+
+    def transform(self, observations: Observations, out: np.ndarray=None) -> np.ndarray:
+        same_window = observations.appends == self._appends and observations[-1] is self._newest_state
+        next_window = self._appends is not None and observations.appends == self._appends + 1 \
+            and len(observations) > 1 and observations[-2] is self._newest_state
+        if next_window:
+            self._push(observations)
+        elif not same_window:
+            self._reset(observations)
+        self._appends, self._newest_state = observations.appends, observations[-1]
+
+        self._refresh_allocation_percentage(observations)
+
+        returns = self._window
+        z_scores = self._output(returns.shape, out)
+        if not len(returns):
+            return z_scores
+
+        count = len(returns)
+        mean = self._shift + self._sum / count
+        variance = np.maximum(self._sumsq / count - (self._sum / count) ** 2, 0.0)
+        # variance below float error of sums is zero variance, all returns in window are the same
+        tolerance = 4 * count * np.finfo(np.float64).eps * self._max_deviation ** 2
+        constant = (variance <= tolerance) | (self._infinite > 0)
+
+        np.divide(returns - mean, np.sqrt(np.where(constant, 1.0, variance)), out=z_scores, casting='same_kind')
+        # ZScoreScaler gives zeros for constant features and features with infinite returns (overflowing std)
+        z_scores[:, constant] = 0.0
+
+        return z_scores
+
+
+class AffineScaler(Scaler):
+    """ Base class for scalers with per-feature statistics fitted once over whole dataset
+
+    Features are open, high, low, close, allocation_percentage and indicator values (same order as MinMaxScaler), 
+    each is transformed as feature * scale + offset, so transform is a single affine numpy operation on feature 
+    block of observations window and training and test runs use identical normalization. allocation_percentage 
+    is already in range [0, 1] and is passed through. Fitted scale and offset are saved with environment config.
+    """
+    def __init__(self, scale: list=None, offset: list=None, dtype: np.dtype=np.float64):
+        super().__init__(dtype)
+        self._scale = np.asarray(scale, dtype=np.float64) if scale is not None else None
+        self._offset = np.asarray(offset, dtype=np.float64) if offset is not None else None
+
+    @property
+    def fitted(self) -> bool:
+        return self._scale is not None
+
+    @staticmethod
+    def raw_features(data_feeder) -> np.ndarray:
+        """ Unscaled features of every row of array-backed data feeder, shape (len, features) or 
+        (len, assets, features) for PanelDataFeeder, allocation_percentage column is zero
+        """
+        assert hasattr(data_feeder, "ohlcv") and len(data_feeder.ohlcv) == len(data_feeder), \
+            "fit requires data feeder that holds whole dataset in arrays (e.g. NumpyDataFeeder)"
+        ohlcv = data_feeder.ohlcv
+        features = np.zeros(ohlcv.shape[:-1] + (5 + data_feeder.indicator_values.shape[-1],))
+        features[..., :4] = ohlcv[..., :4]
+        features[..., 5:] = data_feeder.indicator_values
+
+        return features
+
+    def _statistics(self, features: np.ndarray) -> tuple:
+        """ Scale and offset of each feature, computed from (rows, features) block with nan in rows not computed yet
+        """
+        raise NotImplementedError
+
+    def fit(self, data_feeder) -> "AffineScaler":
+        features = self.raw_features(data_feeder)
+        scale, offset = self._statistics(features.reshape(-1, features.shape[-1]))
+        # allocation_percentage is passed through
+        scale[4], offset[4] = 1.0, 0.0
+        self._scale, self._offset = scale, offset
+
+        return self
+
+    def features(self, data_feeder) -> np.ndarray:
+        assert self.fitted, f"{self.name} must be fitted (or loaded from config) before use"
+        return (self.raw_features(data_feeder) * self._scale + self._offset).astype(self._dtype)
+
+    def transform_window(self, index: int, allocation_percentage: np.ndarray, out: np.ndarray=None) -> np.ndarray:
+        window = self.window(index)
+        results = self._output(window.shape, out)
+        results[...] = window
+        results[..., 4] = allocation_percentage
+
+        return results
+
+    def transform_windows(self, indices: np.ndarray, allocation_percentage: np.ndarray, out: np.ndarray=None) -> np.ndarray:
+        results = self.windows(indices, out=out)
+        results[..., 4] = allocation_percentage
+
+        return results
+
+    def transform(self, observations: Observations, out: np.ndarray=None) -> np.ndarray:
+        assert self.fitted, f"{self.name} must be fitted (or loaded from config) before use"
+        block = self._observation_block(observations)
+        results = self._output(block.shape, out)
+        np.multiply(block, self._scale, out=results, casting='same_kind')
+        np.add(results, self._offset, out=results, casting='same_kind')
+
+        return results
+
+    def config(self) -> dict:
+        if not self.fitted:
+            return super().config()
+        return {"scale": self._scale.tolist(), "offset": self._offset.tolist(), **super().config()}
+
+
+class GlobalMinMaxScaler(AffineScaler):
+    """ Scales each feature into range [0, 1] by its min and max over whole dataset
+    """
+    def _statistics(self, features: np.ndarray) -> tuple:
+        min, max = np.nanmin(features, axis=0), np.nanmax(features, axis=0)
+        value_range = np.where(max > min, max - min, 1.0)
+
+        return 1 / value_range, -min / value_range
+
+
+class GlobalZScoreScaler(AffineScaler):
+    """ Standardizes each feature by its mean and standard deviation over whole dataset
+    """
+    def _statistics(self, features: np.ndarray) -> tuple:
+        mean, std = np.nanmean(features, axis=0), np.nanstd(features, axis=0)
+        std = np.where(std > 0, std, 1.0)
 
-        return z_scores
\ No newline at end of file
+        return 1 / std, -mean / std
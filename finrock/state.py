@@ -1,8 +1,34 @@
 import typing
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timedelta
+
+EPOCH = datetime(1970, 1, 1)
+
+def format_epoch(epoch: int) -> str:
+    """ Timestamp string (YYYY-MM-DD HH:MM:SS) of seconds since epoch
+    """
+    return (EPOCH + timedelta(seconds=int(epoch))).strftime('%Y-%m-%d %H:%M:%S')
+
+def indicator_bounds(indicators: list) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """ Min and max arrays of indicator objects, repeated for each of indicator names
+    """
+    bounds = np.array([[indicator.min, indicator.max] for indicator in indicators for _ in indicator.names], dtype=np.float64)
+    return tuple(bounds.reshape(-1, 2).T)
+
 
 class State:
+    """ Market row and account fields of one timestep
+
+    Attributes are stored in __slots__ to keep cached states small. Indicators are either given as list of 
+    serialised indicators, or state is created by source (StateBatch or PdDataFeeder) and serialised indicators 
+    with render options are built by the source only when `indicators` is accessed (e.g. by PygameRender). 
+    Numeric consumers such as scalers use `indicator_values` and `indicator_bounds` instead.
+    """
+    __slots__ = (
+        'timestamp', 'open', 'high', 'low', 'close', 'volume', 'epoch', 
+        '_indicators', '_indicator_values', '_source', '_index', '_balance', '_assets', '_allocation_percentage'
+    )
+
     def __init__(
             self, 
             timestamp: str, 
@@ -11,7 +37,11 @@ class State:
             low: float, 
             close: float, 
             volume: float=0.0,
-            indicators: list=[]
+            indicators: list=[],
+            epoch: int=None,
+            indicator_values: np.ndarray=None,
+            source: "StateBatch"=None,
+            index: typing.Union[int, tuple]=None,
         ):
         self.timestamp = timestamp
         self.open = open
@@ -19,17 +49,58 @@ class State:
         self.low = low
         self.close = close
         self.volume = volume
-        self.indicators = indicators
+        self._indicators = indicators if source is None else None
+        self._indicator_values = indicator_values
+        self._source = source
+        self._index = index
 
-        try:
-            self.date = datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
-        except ValueError:
-            raise ValueError(f'received invalid timestamp date format: {timestamp}, expected: YYYY-MM-DD HH:MM:SS')
+        # data feeders parse whole timestamp column at once and pass seconds since epoch
+        if epoch is None:
+            try:
+                epoch = int((datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S') - EPOCH).total_seconds())
+            except ValueError:
+                raise ValueError(f'received invalid timestamp date format: {timestamp}, expected: YYYY-MM-DD HH:MM:SS')
+        self.epoch = epoch
         
         self._balance = 0.0 # balance in cash
         self._assets = 0.0 # balance in assets
         self._allocation_percentage = 0.0 # percentage of assets allocated to this state
         
+    @property
+    def date(self) -> datetime:
+        return EPOCH + timedelta(seconds=self.epoch)
+
+    @property
+    def indicators(self) -> list:
+        if self._indicators is None:
+            return self._source.serialised_indicators(self._index)
+        return self._indicators
+
+    @indicators.setter
+    def indicators(self, value: list):
+        self._indicators = value
+        self._indicator_values = None
+        self._source = None
+
+    @property
+    def indicator_values(self) -> np.ndarray:
+        """ Values of all indicators in order of indicators and their names
+        """
+        if self._indicator_values is not None:
+            return self._indicator_values
+        if self._source is not None:
+            return self._source.indicator_values[self._index]
+        return np.array([value for indicator in self._indicators for value in indicator["values"].values()], dtype=np.float64)
+
+    @property
+    def indicator_bounds(self) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """ Min and max of indicator of each value in indicator_values
+        """
+        if self._source is not None:
+            return self._source.indicator_bounds
+        bounds = np.array([[indicator["min"], indicator["max"]] for indicator in self._indicators for _ in indicator["values"]], dtype=np.float64)
+        return tuple(bounds.reshape(-1, 2).T)
+
     @property
     def balance(self):
         return self._balance
@@ -60,39 +131,268 @@ class State:
         self._allocation_percentage = value
     
 
+class AccountState(State):
+    """ State of one environment step, market fields are read from shared State and account fields from Ledger
+
+    Cached market States are never modified, so many environments can step through the same data feeder rows.
+    AccountState is bound to account lists of its episode, that Ledger replaces on reset. Lists are held in 
+    account slots inherited from State, market slots of State are left unused.
+    """
+    __slots__ = ('_state', '_validate', '_step')
+
+    def __init__(self, state: State, ledger: "Ledger", step: int) -> None:
+        self._state = state
+        self._balance = ledger.balance
+        self._assets = ledger.assets
+        self._allocation_percentage = ledger.allocation_percentage
+        self._validate = ledger.validate
+        self._step = step
+
+    @property
+    def state(self) -> State:
+        return self._state
+
+    timestamp = property(lambda self: self._state.timestamp)
+    open = property(lambda self: self._state.open)
+    high = property(lambda self: self._state.high)
+    low = property(lambda self: self._state.low)
+    close = property(lambda self: self._state.close)
+    volume = property(lambda self: self._state.volume)
+    epoch = property(lambda self: self._state.epoch)
+    indicators = property(lambda self: self._state.indicators)
+    indicator_values = property(lambda self: self._state.indicator_values)
+    indicator_bounds = property(lambda self: self._state.indicator_bounds)
+
+    @property
+    def balance(self):
+        return self._balance[self._step]
+    
+    @balance.setter
+    def balance(self, value: float):
+        self._balance[self._step] = value
+
+    @property
+    def assets(self):
+        return self._assets[self._step]
+    
+    @assets.setter
+    def assets(self, value: float):
+        self._assets[self._step] = value
+
+    @property
+    def allocation_percentage(self):
+        return self._allocation_percentage[self._step]
+    
+    @allocation_percentage.setter
+    def allocation_percentage(self, value: float):
+        if self._validate:
+            assert 0.0 <= value <= 1.0, f'allocation_percentage value must be between 0.0 and 1.0, received: {value}'
+        self._allocation_percentage[self._step] = value
+
+
+class Ledger:
+    """ Account fields of one episode: balance, assets and allocation_percentage of each step in preallocated lists
+
+    Lists of floats are used instead of numpy arrays, because environment reads and writes single values per step. 
+    Lists start with at most max_capacity steps of expected episode size and double when episode is longer. New 
+    lists are created on reset and AccountStates hold lists of their own episode, so states of previous episode 
+    (e.g. kept by renderer) stay valid. With validate=False allocation_percentage written through AccountStates 
+    is not range checked.
+    """
+    max_capacity = 1024
+
+    def __init__(self, size: int, validate: bool = True) -> None:
+        self._size = min(size, self.max_capacity)
+        self.validate = validate
+        self.reset()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def reset(self) -> None:
+        self.balance = [0.0] * self._size
+        self.assets = [0.0] * self._size
+        self.allocation_percentage = [0.0] * self._size
+        self._length = 0
+
+    def append(self, state: State, balance: float = 0.0, assets: float = 0.0, allocation_percentage: float = 0.0) -> AccountState:
+        """ Add step of market state with its account fields, returns AccountState view of the step
+        """
+        if state is None:
+            return None
+
+        if self._length == len(self.balance):
+            # episode is longer than expected, grow lists
+            for values in [self.balance, self.assets, self.allocation_percentage]:
+                values.extend([0.0] * (len(values) or 1))
+
+        step = self._length
+        self.balance[step] = balance
+        self.assets[step] = assets
+        self.allocation_percentage[step] = allocation_percentage
+        self._length += 1
+
+        return AccountState(state, self, step)
+
+
+class StateBatch:
+    """ Rows of array-backed data feeder, that creates compact State proxies on demand
+
+    Holds references to feeder arrays, open, high, low, close and volume columns are served as array views. States 
+    created by the batch keep only their row values and read indicator values from indicator_values array.
+    Index of row is int, or (row, asset) tuple for arrays of shape (time, asset, field). Without timestamp array 
+    (timestamp=None) timestamp strings of states are formatted from epoch.
+    """
+    def __init__(
+            self,
+            timestamp: np.ndarray,
+            epoch: np.ndarray,
+            ohlcv: np.ndarray,
+            indicator_values: np.ndarray,
+            valid: np.ndarray,
+            indicators: list = [],
+            indicator_slices: list = [],
+        ) -> None:
+        self.timestamp = timestamp
+        self.epoch = epoch
+        self.ohlcv = ohlcv
+        self.indicator_values = indicator_values
+        self.valid = valid
+        self._indicators = indicators
+        self._indicator_slices = indicator_slices
+
+    def __len__(self) -> int:
+        return len(self.ohlcv)
+
+    def __getitem__(self, index: typing.Union[int, tuple]) -> State:
+        return self.state(index)
+
+    def __iter__(self) -> State:
+        for index in range(len(self)):
+            yield self[index]
+
+    def state(self, index: typing.Union[int, tuple]) -> State:
+        """ State of row at index, None if indicators are not computed for this row
+        """
+        row = index[0] if isinstance(index, tuple) else index
+        if not self.valid[row]:
+            return None
+
+        open, high, low, close, volume = self.ohlcv[index].tolist()
+        return State(
+            timestamp=self.timestamp[row] if self.timestamp is not None else format_epoch(self.epoch[row]),
+            open=open,
+            high=high,
+            low=low,
+            close=close,
+            volume=volume,
+            epoch=int(self.epoch[row]),
+            source=self,
+            index=index
+        )
+
+    @property
+    def indicator_bounds(self) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """ Min and max of indicator of each indicator_values column
+        """
+        return indicator_bounds(self._indicators)
+
+    def serialised_indicators(self, index: typing.Union[int, tuple]) -> list:
+        """ Serialised indicators (with render options) of row at index
+        """
+        values = self.indicator_values[index].tolist()
+        return [
+            indicator.update_values(values[indicator_slice]) 
+            for indicator, indicator_slice in zip(self._indicators, self._indicator_slices)
+        ]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.ohlcv[..., 0]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.ohlcv[..., 1]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.ohlcv[..., 2]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.ohlcv[..., 3]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.ohlcv[..., 4]
+
+
 class Observations:
+    """ Sliding window of last window_size States
+
+    States and their open, high, low, close, volume and allocation_percentage values are kept in preallocated 
+    circular buffers of twice the window size. Each append writes row at position and position + window_size, 
+    so the window is always one contiguous slice: append is O(1) and columns are returned as zero-copy views.
+    With validate=False appended states are not type checked.
+    """
+    columns = ['open', 'high', 'low', 'close', 'volume', 'allocation_percentage']
+    _empty_row = (np.nan,) * len(columns)
+
     def __init__(
             self, 
             window_size: int,
             observations: typing.List[State]=[],
+            validate: bool=True,
         ):
-        self._observations = observations
         self._window_size = window_size
+        self._validate = validate
+
+        assert isinstance(observations, list) == True, "observations must be a list"
+        assert len(observations) <= self._window_size, f'observations length must be <= window_size, received: {len(observations)}'
+        assert all(isinstance(observation, State) for observation in observations) == True, "observations must be a list of State objects"
 
-        assert isinstance(self._observations, list) == True, "observations must be a list"
-        assert len(self._observations) <= self._window_size, f'observations length must be <= window_size, received: {len(self._observations)}'
-        assert all(isinstance(observation, State) for observation in self._observations) == True, "observations must be a list of State objects"
+        self._states = np.empty(2 * window_size, dtype=object)
+        self._values = np.full((2 * window_size, len(self.columns)), np.nan)
+        self.reset()
+        for observation in observations:
+            self.append(observation)
 
     def __len__(self) -> int:
-        return len(self._observations)
+        return self._length
     
     @property
     def window_size(self) -> int:
         return self._window_size
+
+    @property
+    def _window(self) -> slice:
+        """ Slice of buffers with current window, ordered from oldest to newest
+        """
+        end = self._position + self._window_size + 1
+        return slice(end - self._length, end)
     
     @property
     def observations(self) -> typing.List[State]:
-        return self._observations
+        return self._states[self._window].tolist()
     
     @property
     def full(self) -> bool:
-        return len(self._observations) == self._window_size
+        return self._length == self._window_size
+
+    @property
+    def appends(self) -> int:
+        """ Number of states appended since reset, lets consumers update their own state incrementally
+        """
+        return self._appends
     
-    def __getitem__(self, idx: int) -> State:
-        try:
-            return self._observations[idx]
-        except IndexError:
-            raise IndexError(f'index out of range: {idx}, observations length: {len(self._observations)}')
+    def __getitem__(self, idx: typing.Union[int, slice]) -> State:
+        if isinstance(idx, slice):
+            return self._states[self._window][idx].tolist()
+
+        if not -self._length <= idx < self._length:
+            raise IndexError(f'index out of range: {idx}, observations length: {self._length}')
+
+        return self._states[self._window][idx]
         
     def __iter__(self) -> State:
         """ Create a generator that iterate over the Sequence."""
@@ -100,36 +400,69 @@ class Observations:
             yield self[index]
 
     def reset(self) -> None:
-        self._observations = []
+        self._states[:] = None
+        self._position = self._window_size - 1 # position of newest row in lower half of buffers
+        self._length = 0
+        self._appends = 0
     
     def append(self, state: State) -> None:
         # state should be State object or None
-        assert isinstance(state, State) or state is None, "state must be a State object or None"
-        self._observations.append(state)
+        if self._validate:
+            assert isinstance(state, State) or state is None, "state must be a State object or None"
+        if self._length:
+            self._refresh_allocation_percentage()
+
+        position = self._position = (self._position + 1) % self._window_size
+        if self._length < self._window_size:
+            self._length += 1
+        self._appends += 1
 
-        if len(self._observations) > self._window_size:
-            self._observations.pop(0)
+        row = (
+            state.open, state.high, state.low, state.close, state.volume, state.allocation_percentage
+        ) if state is not None else self._empty_row
+
+        self._states[position] = self._states[position + self._window_size] = state
+        self._values[position] = self._values[position + self._window_size] = row
+
+    def _column(self, index: int) -> np.ndarray:
+        end = self._position + self._window_size + 1
+        return self._values[end - self._length:end, index]
 
     @property
     def close(self) -> np.ndarray:
-        return np.array([state.close for state in self._observations])
+        return self._column(3)
     
     @property
     def high(self) -> np.ndarray:
-        return np.array([state.high for state in self._observations])
+        return self._column(1)
     
     @property
     def low(self) -> np.ndarray:
-        return np.array([state.low for state in self._observations])
+        return self._column(2)
     
     @property
     def open(self) -> np.ndarray:
-        return np.array([state.open for state in self._observations])
+        return self._column(0)
     
+    def _refresh_allocation_percentage(self) -> None:
+        # environment fills account fields of newest state after it is appended, so its value is read again
+        state = self._states[self._position]
+        value = state.allocation_percentage if state is not None else np.nan
+        self._values[self._position, 5] = self._values[self._position + self._window_size, 5] = value
+
     @property
     def allocation_percentage(self) -> np.ndarray:
-        return np.array([state.allocation_percentage for state in self._observations])
+        if self._length:
+            self._refresh_allocation_percentage()
+
+        return self._column(5)
+
+    @property
+    def indicator_values(self) -> np.ndarray:
+        """ Indicator values of states in window, shape (len, values)
+        """
+        return np.array([state.indicator_values for state in self._states[self._window]])
 
     @property
     def volume(self) -> np.ndarray:
-        return np.array([state.volume for state in self._observations])
\ No newline at end of file
+        return self._column(4)
@@ -1,18 +1,46 @@
 import os
 import json
 import typing
+import inspect
 import importlib
 import numpy as np
 
 from enum import Enum
-from .state import State, Observations
-from .data_feeder import PdDataFeeder
+from .state import State, Observations, Ledger
+from .data_feeder import PdDataFeeder, PanelDataFeeder
 from .reward import SimpleReward
 
+def load_output_transformer(config: dict) -> typing.Callable:
+    """ Create scaler from environment config, fitted statistics are restored from its saved config
+    """
+    scaler_class = getattr(importlib.import_module(".scalers", package=__package__), config["output_transformer"])
+    return scaler_class.from_config(config.get("output_transformer_config", {}))
+
+
 class ActionSpace(Enum):
     DISCRETE = 3
     CONTINUOUS = 2
 
+
+class Validation(Enum):
+    """ STRICT checks every step (types of states and observations, allocation range, nan in observation), FAST 
+    validates dataset once with data_feeder.validate() and skips per-step checks
+    """
+    STRICT = "strict"
+    FAST = "fast"
+
+def validation_kwargs(function: typing.Callable, validate: bool) -> dict:
+    """ Keyword arguments passing validation mode to reward function or metric update on every call, components 
+    are shared between environments (and default arguments), so the mode is never set on them
+    """
+    if validate:
+        return {}
+    try:
+        parameters = inspect.signature(function).parameters
+    except (TypeError, ValueError):
+        return {}
+    return {"validate": False} if "validate" in parameters else {}
+
 class TradingEnv:
     def __init__(
             self,
@@ -24,7 +52,9 @@ class TradingEnv:
             reward_function: typing.Callable = SimpleReward(),
             action_space: ActionSpace = ActionSpace.DISCRETE,
             metrics: typing.List[typing.Callable] = [],
-            order_fee_percent: float = 0.001
+            order_fee_percent: float = 0.001,
+            precompute_observations: bool = False,
+            validation: Validation = Validation.STRICT,
         ) -> None:
         self._data_feeder = data_feeder
         self._output_transformer = output_transformer
@@ -34,9 +64,24 @@ class TradingEnv:
         self._reward_function = reward_function
         self._metrics = metrics
         self._order_fee_percent = order_fee_percent
-
-        self._observations = Observations(window_size=window_size)
-        self._observation_space = np.zeros(self.reset()[0].shape)
+        self._precompute_observations = precompute_observations
+        self._validation = Validation(validation)
+        self._validate = self._validation == Validation.STRICT
+
+        if not self._validate:
+            self._data_feeder.validate()
+        self._reward_kwargs = validation_kwargs(self._reward_function, self._validate)
+        self._metrics_kwargs = [validation_kwargs(metric.update, self._validate) for metric in self._metrics]
+
+        # market part of observations is computed once for whole dataset, only account part is filled per step
+        if self._precompute_observations:
+            self._output_transformer.precompute(self._data_feeder, window_size)
+
+        self._observations = Observations(window_size=window_size, validate=self._validate)
+        # account fields live in per-env ledger, cached market states of data feeder are shared and never modified
+        self._ledger = Ledger(size=self._max_episode_steps, validate=self._validate)
+        observation = self.reset()[0]
+        self._observation_space = np.zeros(observation.shape, dtype=observation.dtype)
         self._action_space = action_space
         self.fee_ratio = 1 - self._order_fee_percent
 
@@ -48,18 +93,24 @@ class TradingEnv:
     def observation_space(self):
         return self._observation_space
 
-    def _get_obs(self, index: int, balance: float=None) -> State:
-        next_state = self._data_feeder[index]
-        if next_state is None:
-            return None
-
-        if balance is not None:
-            next_state.balance = balance
-
-        return next_state
+    def _get_obs(self, index: int, balance: float=0.0) -> State:
+        return self._ledger.append(self._data_feeder[index], balance=balance)
     
     def _get_terminated(self):
         return False
+
+    def _transform_observations(self, index: int) -> np.ndarray:
+        """ Transform observations window, that ends with row at index of data feeder
+        """
+        if self._precompute_observations:
+            transformed_obs = self._output_transformer.transform_window(index, self._observations.allocation_percentage)
+        else:
+            transformed_obs = self._output_transformer.transform(self._observations)
+
+        if self._validate and np.isnan(transformed_obs).any():
+            raise ValueError("transformed_obs contains nan values, check your data")
+
+        return transformed_obs
         
     def _take_action(self, action_pred: typing.Union[int, np.ndarray]) -> typing.Tuple[int, float]:
         """
@@ -109,10 +160,11 @@ class TradingEnv:
             next_state.assets = last_state.assets
             next_state.balance = last_state.balance
 
-        if next_state.allocation_percentage > 1.0:
-            raise ValueError(f'next_state.allocation_percentage > 1.0: {next_state.allocation_percentage}')
-        elif next_state.allocation_percentage < 0.0:
-            raise ValueError(f'next_state.allocation_percentage < 0.0: {next_state.allocation_percentage}')
+        if self._validate:
+            if next_state.allocation_percentage > 1.0:
+                raise ValueError(f'next_state.allocation_percentage > 1.0: {next_state.allocation_percentage}')
+            elif next_state.allocation_percentage < 0.0:
+                raise ValueError(f'next_state.allocation_percentage < 0.0: {next_state.allocation_percentage}')
 
         return action, order_size
     
@@ -123,8 +175,8 @@ class TradingEnv:
     def _metricsHandler(self, observation: State):
         metrics = {}
         # Loop through metrics and update
-        for metric in self._metrics:
-            metric.update(observation)
+        for metric, kwargs in zip(self._metrics, self._metrics_kwargs):
+            metric.update(observation, **kwargs)
             metrics[metric.name] = metric.result
 
         return metrics
@@ -138,7 +190,7 @@ class TradingEnv:
         self._observations.append(observation)
 
         action, order_size = self._take_action(action)
-        reward = self._reward_function(self._observations)
+        reward = self._reward_function(self._observations, **self._reward_kwargs)
         terminated = self._get_terminated()
         truncated = False if self._env_step_indexes else True
         info = {
@@ -146,10 +198,7 @@ class TradingEnv:
             "metrics": self._metricsHandler(observation)
             }
 
-        transformed_obs = self._output_transformer.transform(self._observations)
-
-        if np.isnan(transformed_obs).any():
-            raise ValueError("transformed_obs contains nan values, check your data")
+        transformed_obs = self._transform_observations(index)
 
         return transformed_obs, reward, terminated, truncated, info
 
@@ -162,8 +211,10 @@ class TradingEnv:
 
         # Initial observations are the first states of the window size
         self._observations.reset()
+        self._ledger.reset()
         while not self._observations.full:
-            obs = self._get_obs(self._env_step_indexes.pop(0), balance=self._initial_balance)
+            index = self._env_step_indexes.pop(0)
+            obs = self._get_obs(index, balance=self._initial_balance)
             if obs is None:
                 continue
             # update observations object with new observation
@@ -178,9 +229,7 @@ class TradingEnv:
         for metric in self._metrics:
             metric.reset(self._observations.observations[-1])
 
-        transformed_obs = self._output_transformer.transform(self._observations)
-        if np.isnan(transformed_obs).any():
-            raise ValueError("transformed_obs contains nan values, check your data")
+        transformed_obs = self._transform_observations(index)
         
         # return state and info
         return transformed_obs, info
@@ -207,6 +256,9 @@ class TradingEnv:
             "order_fee_percent": self._order_fee_percent,
             "observation_space_shape": tuple(self.observation_space.shape),
             "action_space": self._action_space.name,
+            "precompute_observations": self._precompute_observations,
+            "validation": self._validation.name,
+            "output_transformer_config": self._output_transformer.config(),
         }
     
     def save_config(self, path: str = ""):
@@ -229,14 +281,446 @@ class TradingEnv:
 
         environment = TradingEnv(
             data_feeder = data_feeder,
-            output_transformer = getattr(importlib.import_module(".scalers", package=__package__), config["output_transformer"])(),
+            output_transformer = load_output_transformer(config),
             initial_balance = kwargs.get("initial_balance") or config["initial_balance"],
             max_episode_steps = kwargs.get("max_episode_steps") or config["max_episode_steps"],
             window_size = kwargs.get("window_size") or config["window_size"],
             reward_function = getattr(importlib.import_module(".reward", package=__package__), config["reward_function"])(),
             action_space = ActionSpace[config["action_space"]],
             metrics = [getattr(importlib.import_module(".metrics", package=__package__), metric)() for metric in config["metrics"]],
-            order_fee_percent = kwargs.get("order_fee_percent") or config["order_fee_percent"]
+            order_fee_percent = kwargs.get("order_fee_percent") or config["order_fee_percent"],
+            precompute_observations = kwargs.get("precompute_observations", config.get("precompute_observations", False)),
+            validation = kwargs.get("validation", Validation[config.get("validation", "STRICT")]),
         )
         
-        return environment
\ No newline at end of file
+        return environment
+
+class PortfolioTradingEnv:
+    """ Trading environment over multiple assets of PanelDataFeeder
+
+    Action is continuous allocation vector, one weight in range [0, 1] per asset, remaining part of account 
+    value is held in cash (weights summing over 1 are normalized). Portfolio is rebalanced to target weights 
+    at close of previous row, sells are executed before buys and buys are scaled down to available balance.
+    Market part of observations is always precomputed by output_transformer, observation has shape 
+    (window_size, assets, features) for MinMaxScaler and (window_size - 1, assets, features) for ZScoreScaler.
+    """
+    def __init__(
+            self,
+            data_feeder: PanelDataFeeder,
+            output_transformer: typing.Callable = None,
+            initial_balance: float = 1000.0,
+            max_episode_steps: int = None,
+            window_size: int = 50,
+            order_fee_percent: float = 0.001,
+            validation: Validation = Validation.STRICT,
+        ) -> None:
+        assert isinstance(data_feeder, PanelDataFeeder), "data_feeder must be an instance of PanelDataFeeder"
+        self._data_feeder = data_feeder
+        self._output_transformer = output_transformer
+        self._initial_balance = initial_balance
+        self._max_episode_steps = max_episode_steps if max_episode_steps is not None else len(data_feeder)
+        self._window_size = window_size
+        self._order_fee_percent = order_fee_percent
+        self.fee_ratio = 1 - self._order_fee_percent
+        self._validation = Validation(validation)
+        self._validate = self._validation == Validation.STRICT
+
+        if not self._validate:
+            self._data_feeder.validate()
+
+        self._num_assets = len(data_feeder.assets)
+        self._close = data_feeder.ohlcv[..., 3]
+        self._output_transformer.precompute(self._data_feeder, window_size)
+
+        observation = self.reset()[0]
+        self._observation_space = np.zeros(observation.shape, dtype=observation.dtype)
+
+    @property
+    def action_space(self):
+        return self._num_assets
+
+    @property
+    def observation_space(self):
+        return self._observation_space
+
+    @property
+    def assets(self):
+        return self._data_feeder.assets
+
+    def _get_terminated(self):
+        return False
+
+    def _transform_observations(self, index: int) -> np.ndarray:
+        transformed_obs = self._output_transformer.transform_window(index, self._allocations)
+
+        if self._validate and np.isnan(transformed_obs).any():
+            raise ValueError("transformed_obs contains nan values, check your data")
+
+        return transformed_obs
+
+    def _take_action(self, action_pred: np.ndarray, last_close: np.ndarray) -> np.ndarray:
+        """ Rebalance portfolio to target weights at last_close prices, returns executed weights
+        """
+        weights = np.clip(np.asarray(action_pred, dtype=np.float64).reshape(-1), 0, 1)
+        assert len(weights) == self._num_assets, f'action must have weight for each of {self._num_assets} assets, received: {len(weights)}'
+        weights = np.around(weights, decimals=2)
+        if weights.sum() > 1.0:
+            weights = weights / weights.sum()
+
+        holdings = self._assets * last_close
+        target = weights * (self._balance + holdings.sum())
+        delta = target - holdings
+
+        # sell first, so proceeds can be used for buys
+        sell = np.minimum(delta, 0)
+        self._balance += -sell.sum() * self.fee_ratio
+        self._assets += sell / last_close
+
+        buy = np.maximum(delta, 0)
+        if buy.sum() > self._balance:
+            buy *= self._balance / buy.sum()
+        self._balance -= buy.sum()
+        self._assets += buy * self.fee_ratio / last_close
+
+        return weights
+
+    def step(self, action: np.ndarray) -> typing.Tuple[np.ndarray, float, bool, bool, dict]:
+
+        index = self._env_step_indexes.pop(0)
+        last_close, next_close = self._close[self._index], self._close[index]
+
+        last_account_value = self._account_value
+        weights = self._take_action(action, last_close)
+
+        holdings = self._assets * next_close
+        self._account_value = self._balance + holdings.sum()
+        self._index = index
+
+        # allocations window rolls by one row, newest row holds allocation at close of current row
+        self._allocations[:-1] = self._allocations[1:]
+        self._allocations[-1] = holdings / self._account_value
+
+        reward = (self._account_value - last_account_value) / last_account_value
+        terminated = self._get_terminated()
+        truncated = False if self._env_step_indexes else True
+        info = {
+            "states": [self._data_feeder[index]],
+            "account_value": self._account_value,
+            "balance": self._balance,
+            "assets": self._assets.copy(),
+            "weights": weights,
+            "allocation": self._allocations[-1].copy(),
+            }
+
+        transformed_obs = self._transform_observations(index)
+
+        return transformed_obs, reward, terminated, truncated, info
+
+    def reset(self) -> typing.Tuple[np.ndarray, dict]:
+        """ Reset the environment and return the initial state
+        """
+        size = len(self._data_feeder) - self._max_episode_steps
+        self._env_start_index = np.random.randint(0, size) if size > 0 else 0
+        self._env_step_indexes = list(range(self._env_start_index, self._env_start_index + self._max_episode_steps))
+
+        # Initial window must consist of window_size consecutive valid rows
+        valid_rows, states = 0, []
+        while valid_rows < self._window_size:
+            index = self._env_step_indexes.pop(0)
+            obs = self._data_feeder[index]
+            valid_rows = valid_rows + 1 if obs is not None else 0
+            states = states + [obs] if obs is not None else []
+
+        self._index = index
+        self._balance = float(self._initial_balance)
+        self._assets = np.zeros(self._num_assets)
+        self._account_value = self._balance
+        self._allocations = np.zeros((self._window_size, self._num_assets))
+
+        info = {
+            "states": states,
+            "account_value": self._account_value,
+            }
+
+        transformed_obs = self._transform_observations(index)
+
+        return transformed_obs, info
+
+    def render(self):
+        raise NotImplementedError
+
+    def close(self):
+        """ Close the environment
+        """
+        pass
+
+    def config(self):
+        """ Return the environment configuration
+        """
+        return {
+            "data_feeder": self._data_feeder.__name__,
+            "assets": self._data_feeder.assets,
+            "output_transformer": self._output_transformer.__name__,
+            "initial_balance": self._initial_balance,
+            "max_episode_steps": self._max_episode_steps,
+            "window_size": self._window_size,
+            "order_fee_percent": self._order_fee_percent,
+            "observation_space_shape": tuple(self.observation_space.shape),
+            "action_space": self.action_space,
+            "validation": self._validation.name,
+            "output_transformer_config": self._output_transformer.config(),
+        }
+
+    def save_config(self, path: str = ""):
+        """ Save the environment configuration
+        """
+        output_path = os.path.join(path, "PortfolioTradingEnv.json")
+        with open(output_path, "w") as f:
+            json.dump(self.config(), f, indent=4)
+
+    @staticmethod
+    def load_config(data_feeder, path: str = "", **kwargs):
+        """ Load the environment configuration
+        """
+
+        input_path = os.path.join(path, "PortfolioTradingEnv.json")
+        if not os.path.exists(input_path):
+            raise Exception(f"PortfolioTradingEnv Config file not found in {path}")
+        with open(input_path, "r") as f:
+            config = json.load(f)
+
+        assert list(data_feeder.assets) == config["assets"], f"data_feeder assets {data_feeder.assets} do not match config assets {config['assets']}"
+
+        environment = PortfolioTradingEnv(
+            data_feeder = data_feeder,
+            output_transformer = load_output_transformer(config),
+            initial_balance = kwargs.get("initial_balance") or config["initial_balance"],
+            max_episode_steps = kwargs.get("max_episode_steps") or config["max_episode_steps"],
+            window_size = kwargs.get("window_size") or config["window_size"],
+            order_fee_percent = kwargs.get("order_fee_percent") or config["order_fee_percent"],
+            validation = kwargs.get("validation", Validation[config.get("validation", "STRICT")]),
+        )
+
+        return environment
+
+
+class BatchTradingEnv:
+    """ num_envs episodes of TradingEnv simulated at once in numpy arrays
+
+    Episode cursors, balances, assets and allocation windows of all environments are arrays with num_envs rows. 
+    step takes (num_envs,) discrete actions or (num_envs, 2) continuous actions and applies buy, sell and hold 
+    of TradingEnv to all environments at once. Market part of observations is precomputed by output_transformer 
+    and windows of all environments are gathered from its feature array with one fancy-indexing call, so cost 
+    of step grows with size of observations instead of number of Python environment objects.
+
+    Reward is relative change of account value (same as AccountValueChangeReward). Environments that reach the 
+    end of their episode are reset within step, their returned observation is the first observation of new 
+    episode. Dataset is validated once with data_feeder.validate(), so there are no per-step checks.
+    """
+    def __init__(
+            self,
+            data_feeder: PdDataFeeder,
+            output_transformer: typing.Callable = None,
+            num_envs: int = 256,
+            initial_balance: float = 1000.0,
+            max_episode_steps: int = None,
+            window_size: int = 50,
+            action_space: ActionSpace = ActionSpace.DISCRETE,
+            order_fee_percent: float = 0.001,
+        ) -> None:
+        assert hasattr(data_feeder, "ohlcv") and not isinstance(data_feeder, PanelDataFeeder), \
+            "data_feeder must be single asset data feeder, that holds whole dataset in arrays (e.g. NumpyDataFeeder)"
+        assert num_envs > 0, f"num_envs must be > 0, received: {num_envs}"
+        self._data_feeder = data_feeder
+        self._output_transformer = output_transformer
+        self._num_envs = num_envs
+        self._initial_balance = initial_balance
+        self._max_episode_steps = max_episode_steps if max_episode_steps is not None else len(data_feeder)
+        self._window_size = window_size
+        self._action_space = action_space
+        self._order_fee_percent = order_fee_percent
+        self.fee_ratio = 1 - self._order_fee_percent
+
+        self._data_feeder.validate()
+        # rows before indicators warmup are skipped, all following rows are valid
+        self._first_row = int(np.argmax(data_feeder.valid))
+        self._close = np.asarray(data_feeder.ohlcv[:, 3], dtype=np.float64)
+        self._output_transformer.precompute(self._data_feeder, window_size)
+
+        self._index = np.zeros(num_envs, dtype=np.int64)
+        self._end = np.zeros(num_envs, dtype=np.int64)
+        self._balance = np.zeros(num_envs)
+        self._assets = np.zeros(num_envs)
+        self._allocations = np.zeros((num_envs, window_size))
+
+        observation = self.reset()[0]
+        self._observation_space = np.zeros(observation.shape[1:], dtype=observation.dtype)
+
+    @property
+    def num_envs(self) -> int:
+        return self._num_envs
+
+    @property
+    def action_space(self):
+        return self._action_space.value
+
+    @property
+    def observation_space(self):
+        """ Observation of one environment, step returns observations of all environments stacked along first axis
+        """
+        return self._observation_space
+
+    def _get_terminated(self) -> np.ndarray:
+        return np.zeros(self._num_envs, dtype=bool)
+
+    def _transform_observations(self) -> np.ndarray:
+        return self._output_transformer.transform_windows(self._index, self._allocations)
+
+    def _reset_envs(self, envs: np.ndarray) -> None:
+        """ Start new episodes of environments with given indices
+        """
+        size = len(self._data_feeder) - self._max_episode_steps
+        start = np.random.randint(0, size, len(envs)) if size > 0 else np.zeros(len(envs), dtype=np.int64)
+
+        # first observation is window of window_size valid rows, same as in TradingEnv.reset
+        self._index[envs] = np.maximum(start, self._first_row) + self._window_size - 1
+        self._end[envs] = start + self._max_episode_steps - 1
+        assert (self._index[envs] < self._end[envs]).all(), \
+            f"max_episode_steps must be longer than window_size plus indicators warmup ({self._first_row} rows)"
+
+        self._balance[envs] = self._initial_balance
+        self._assets[envs] = 0.0
+        self._allocations[envs] = 0.0
+
+    def _take_action(self, actions: np.ndarray, last_close: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """ Apply buy (2), sell (1) or hold (0) of every environment at last_close prices, returns executed 
+        actions and order sizes
+        """
+        actions = np.asarray(actions)
+        if actions.ndim == 2:
+            assert actions.shape == (self._num_envs, 2), f'continuous actions must have shape ({self._num_envs}, 2), received: {actions.shape}'
+            order_size = np.around(np.clip(actions[:, 1], 0, 1), decimals=2)
+            action = ((np.clip(actions[:, 0], -1, 1) + 1) * 1.5).astype(np.int64) # scale from -1,1 to 0,3
+            # hold (0) if order size is zero
+            action[order_size == 0] = 0
+        else:
+            assert actions.shape == (self._num_envs,), f'discrete actions must have shape ({self._num_envs},), received: {actions.shape}'
+            assert ((actions >= 0) & (actions < self._action_space.value)).all(), f'actions must be in range {self._action_space.value}'
+            order_size = np.ones(self._num_envs)
+            action = actions
+
+        allocation, balance, assets = self._allocations[:, -1], self._balance, self._assets
+
+        # hold (0) if we are out of balance or out of assets, order sizes of held actions are zero, so each 
+        # account field is one expression for buy, sell and hold with the same results as TradingEnv._take_action
+        buy = (action == 2) & (allocation != 1.0)
+        sell = (action == 1) & (allocation != 0.0)
+        buy_size, sell_size = buy * order_size, sell * order_size
+
+        next_allocation = allocation + (1 - allocation) * buy_size - allocation * sell_size
+        self._assets = assets + (balance * buy_size / last_close) * self.fee_ratio - (assets * sell_size) * self.fee_ratio
+        self._balance = balance - (balance * buy_size) * self.fee_ratio + (assets * sell_size * last_close) * self.fee_ratio
+
+        # allocations window rolls by one row, newest row holds allocation after action
+        self._allocations[:, :-1] = self._allocations[:, 1:]
+        self._allocations[:, -1] = next_allocation
+
+        return 2 * buy + sell, order_size
+
+    def step(self, actions: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        last_close = self._close[self._index]
+        last_account_value = self._balance + self._assets * last_close
+
+        action, order_size = self._take_action(actions, last_close)
+
+        self._index += 1
+        account_value = self._balance + self._assets * self._close[self._index]
+
+        reward = (account_value - last_account_value) / last_account_value
+        terminated = self._get_terminated()
+        truncated = self._index == self._end
+        info = {
+            "index": self._index.copy(),
+            "action": action,
+            "order_size": order_size,
+            "account_value": account_value,
+            "balance": self._balance.copy(),
+            "assets": self._assets.copy(),
+            "allocation_percentage": self._allocations[:, -1].copy(),
+            }
+
+        if truncated.any():
+            self._reset_envs(np.flatnonzero(truncated))
+
+        transformed_obs = self._transform_observations()
+
+        return transformed_obs, reward, terminated, truncated, info
+
+    def reset(self) -> typing.Tuple[np.ndarray, dict]:
+        """ Reset all environments and return their initial states
+        """
+        self._reset_envs(np.arange(self._num_envs))
+
+        info = {
+            "index": self._index.copy(),
+            "account_value": self._balance + self._assets * self._close[self._index],
+            }
+
+        transformed_obs = self._transform_observations()
+
+        return transformed_obs, info
+
+    def render(self):
+        raise NotImplementedError
+
+    def close(self):
+        """ Close the environment
+        """
+        pass
+
+    def config(self):
+        """ Return the environment configuration
+        """
+        return {
+            "data_feeder": self._data_feeder.__name__,
+            "output_transformer": self._output_transformer.__name__,
+            "num_envs": self._num_envs,
+            "initial_balance": self._initial_balance,
+            "max_episode_steps": self._max_episode_steps,
+            "window_size": self._window_size,
+            "order_fee_percent": self._order_fee_percent,
+            "observation_space_shape": tuple(self.observation_space.shape),
+            "action_space": self._action_space.name,
+            "output_transformer_config": self._output_transformer.config(),
+        }
+
+    def save_config(self, path: str = ""):
+        """ Save the environment configuration
+        """
+        output_path = os.path.join(path, "BatchTradingEnv.json")
+        with open(output_path, "w") as f:
+            json.dump(self.config(), f, indent=4)
+
+    @staticmethod
+    def load_config(data_feeder, path: str = "", **kwargs):
+        """ Load the environment configuration
+        """
+
+        input_path = os.path.join(path, "BatchTradingEnv.json")
+        if not os.path.exists(input_path):
+            raise Exception(f"BatchTradingEnv Config file not found in {path}")
+        with open(input_path, "r") as f:
+            config = json.load(f)
+
+        environment = BatchTradingEnv(
+            data_feeder = data_feeder,
+            output_transformer = load_output_transformer(config),
+            num_envs = kwargs.get("num_envs") or config["num_envs"],
+            initial_balance = kwargs.get("initial_balance") or config["initial_balance"],
+            max_episode_steps = kwargs.get("max_episode_steps") or config["max_episode_steps"],
+            window_size = kwargs.get("window_size") or config["window_size"],
+            action_space = ActionSpace[config["action_space"]],
+            order_fee_percent = kwargs.get("order_fee_percent") or config["order_fee_percent"],
+        )
+
+        return environment
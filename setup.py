@@ -37,6 +37,7 @@ setup(
     author='PyLessons',
     author_email='pythonlessons0@gmail.com',
     install_requires=requirements,
+    extras_require={'fast': ['numba']},
     python_requires='>=3',
     packages = find_packages(exclude=['*.pyc']),
     include_package_data=True,
@@ -0,0 +1,27 @@
+import os
+import sys
+import pytest
+import pandas as pd
+
+from finrock.indicators import PanelFrame
+
+# benchmarks and tests share price generators of bin/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bin'))
+from create_random_walk_data import create_random_walk_df
+
+
+@pytest.fixture
+def random_walk_df():
+    """ Factory of random walk OHLC DataFrames: random_walk_df(num_samples, seed, timestamps), without timestamps by default
+    """
+    return lambda num_samples=500, seed=0, timestamps=False: create_random_walk_df(num_samples, seed=seed, timestamps=timestamps)
+
+
+@pytest.fixture
+def random_walk_panel(random_walk_df):
+    """ Factory of PanelFrames of num_assets random walks (seeds 0..num_assets-1): random_walk_panel(num_assets, num_samples)
+    """
+    def make(num_assets=3, num_samples=500):
+        dfs = [random_walk_df(num_samples, seed=seed) for seed in range(num_assets)]
+        return PanelFrame({column: pd.concat([df[column] for df in dfs], axis=1, keys=range(num_assets)) for column in dfs[0]})
+    return make
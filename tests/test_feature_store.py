@@ -0,0 +1,43 @@
+import numpy as np
+
+from finrock.indicators import FeatureStore, SMA, BolingerBands, RSI, RSISweep
+
+
+def test_indicators_use_given_store(random_walk_df):
+    store = FeatureStore(random_walk_df())
+    sma = SMA(data=store, period=20)
+    bolinger_bands = BolingerBands(data=store, period=20)
+
+    assert sma._store is store
+    assert bolinger_bands._store is store
+
+
+def test_indicators_share_cached_series(random_walk_df):
+    store = FeatureStore(random_walk_df())
+    sma = SMA(data=store, period=20)
+    BolingerBands(data=store, period=20)
+
+    # rolling mean is computed once by SMA and served from cache to BolingerBands
+    assert store.misses == 2 # rolling mean and rolling std
+    assert store.hits == 1
+    assert store.rolling_mean('close', 20) is sma._outputs['SMA20']
+
+
+def test_rsi_shares_gains_and_losses(random_walk_df):
+    store = FeatureStore(random_walk_df())
+    RSI(data=store, period=14)
+    gain, loss = store[('gain', 'close')], store[('loss', 'close')]
+    RSISweep(data=store, periods=[7, 14])
+
+    assert store[('gain', 'close')] is gain
+    assert store[('loss', 'close')] is loss
+
+
+def test_shared_store_gives_same_values_as_own_store(random_walk_df):
+    df = random_walk_df()
+    store = FeatureStore(df)
+    shared = [SMA(data=store, period=20), BolingerBands(data=store, period=20), RSI(data=store, period=14)]
+    separate = [SMA(data=df, period=20), BolingerBands(data=df, period=20), RSI(data=df, period=14)]
+
+    for a, b in zip(shared, separate):
+        np.testing.assert_array_equal(a.to_numpy(), b.to_numpy())
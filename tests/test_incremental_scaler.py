@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from finrock.data_feeder import NumpyDataFeeder
+from finrock.trading_env import TradingEnv, ActionSpace
+from finrock.scalers import ZScoreScaler, IncrementalZScoreScaler
+from finrock.indicators import RSI, PSAR
+
+
+@pytest.mark.parametrize('resync_every', [None, 7])
+def test_incremental_zscore_matches_zscore(random_walk_df, resync_every):
+    """ Continuous actions move allocation percentage from and to zero (infinite returns), resets rebuild window
+    """
+    df = random_walk_df(3000, timestamps=True)
+    data_feeder = NumpyDataFeeder(df, indicators=[RSI(data=df), PSAR(data=df)])
+    envs = [
+        TradingEnv(data_feeder, scaler, window_size=50, max_episode_steps=500, action_space=ActionSpace.CONTINUOUS)
+        for scaler in [ZScoreScaler(), IncrementalZScoreScaler(resync_every=resync_every)]
+    ]
+    actions = np.random.default_rng(0).uniform(-1, 1, (2000, 2))
+
+    def reset(seed: int) -> list:
+        observations = []
+        for env in envs:
+            np.random.seed(seed) # both environments start episode at the same row
+            observations.append(env.reset()[0])
+        return observations
+
+    observations, max_difference, resets = reset(0), 0.0, 0
+    for step, action in enumerate(actions):
+        max_difference = max(max_difference, np.abs(observations[0] - observations[1]).max())
+        results = [env.step(action) for env in envs]
+        observations = [result[0] for result in results]
+        if results[0][3]:
+            observations, resets = reset(step), resets + 1
+
+    assert resets > 0
+
+    assert max_difference < 1e-6
+
+
+def test_precomputed_zscore_matches_zscore(random_walk_df):
+    """ Window statistics of precomputed market features give the same z-scores as transform of observations
+    """
+    df = random_walk_df(3000, timestamps=True)
+    data_feeder = NumpyDataFeeder(df, indicators=[RSI(data=df), PSAR(data=df)])
+    envs = [
+        TradingEnv(data_feeder, ZScoreScaler(), window_size=50, max_episode_steps=2000, action_space=ActionSpace.CONTINUOUS, precompute_observations=precompute)
+        for precompute in [False, True]
+    ]
+    observations = []
+    for env in envs:
+        np.random.seed(0)
+        observations.append(env.reset()[0])
+
+    max_difference = 0.0
+    for action in np.random.default_rng(0).uniform(-1, 1, (1500, 2)):
+        max_difference = max(max_difference, np.abs(observations[0] - observations[1]).max())
+        observations = [env.step(action)[0] for env in envs]
+
+    assert max_difference < 1e-9
+
+
+def test_zscore_windows_match_window(random_walk_df):
+    df = random_walk_df(1000, timestamps=True)
+    data_feeder = NumpyDataFeeder(df, indicators=[RSI(data=df), PSAR(data=df)])
+    scaler = ZScoreScaler()
+    scaler.precompute(data_feeder, 50)
+
+    indices = np.arange(100, 900, 10)
+    # allocation windows moving from and to zero, and constant ones
+    allocations = np.random.default_rng(0).choice([0.0, 0.5, 1.0], (len(indices), 50))
+    allocations[::4] = 0.5
+
+    expected = np.stack([scaler.transform_window(index, allocation) for index, allocation in zip(indices, allocations)])
+    np.testing.assert_allclose(scaler.transform_windows(indices, allocations), expected, rtol=1e-12, atol=1e-12)
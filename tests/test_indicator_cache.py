@@ -0,0 +1,22 @@
+import numpy as np
+
+from finrock.indicators import BolingerBands, RSI
+
+
+def test_cached_values_match_computed(random_walk_df, tmp_path):
+    df = random_walk_df()
+    for indicator_class in [BolingerBands, RSI]:
+        computed = indicator_class(data=df, cache_dir=str(tmp_path))
+        cached = indicator_class(data=df, cache_dir=str(tmp_path))
+        np.testing.assert_array_equal(computed.to_numpy(), cached.to_numpy())
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_cached_panel_values_match_computed(random_walk_panel, tmp_path):
+    panel = random_walk_panel()
+    for indicator_class in [BolingerBands, RSI]:
+        computed = indicator_class(data=panel, cache_dir=str(tmp_path))
+        cached = indicator_class(data=panel, cache_dir=str(tmp_path))
+        assert cached.to_numpy().shape == (500, 3, len(cached.names))
+        np.testing.assert_array_equal(computed.to_numpy(), cached.to_numpy())
+        assert list(cached._outputs[cached.names[0]].columns) == list(panel['close'].columns)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from finrock import indicators
+from finrock.indicators import SMA, EMA, RSI, SMASweep, EMASweep, RSISweep
+
+PERIODS = [5, 14, 30]
+SWEEPS = [(SMASweep, SMA), (EMASweep, EMA), (RSISweep, RSI)]
+
+
+@pytest.fixture(params=['compiled', 'python', 'pandas'])
+def kernels(request, monkeypatch):
+    """ Run sweeps with numba kernels (when installed), same kernels as plain python loops and pandas fallback
+    """
+    if request.param == 'compiled' and indicators.njit is None:
+        pytest.skip('numba is not installed')
+    if request.param == 'python':
+        monkeypatch.setattr(indicators, '_ema_compiled', indicators._ema_loop)
+        monkeypatch.setattr(indicators, '_decayed_sum_compiled', indicators._decayed_sum_loop)
+    if request.param == 'pandas':
+        monkeypatch.setattr(indicators, '_ema_compiled', None)
+        monkeypatch.setattr(indicators, '_decayed_sum_compiled', None)
+    return request.param
+
+
+def assert_sweep_matches(sweep_class, indicator_class, data):
+    sweep = sweep_class(data=data, periods=PERIODS).to_numpy()
+    for i, period in enumerate(PERIODS):
+        expected = indicator_class(data=data, period=period).to_numpy()[..., 0]
+        np.testing.assert_allclose(sweep[..., i], expected, rtol=1e-9, atol=1e-9)
+    return sweep
+
+
+@pytest.mark.parametrize('sweep_class, indicator_class', SWEEPS)
+def test_sweep_matches_indicators(kernels, random_walk_df, sweep_class, indicator_class):
+    assert_sweep_matches(sweep_class, indicator_class, random_walk_df(2000))
+
+
+@pytest.mark.parametrize('sweep_class, indicator_class', SWEEPS)
+def test_sweep_restarts_after_nan(kernels, random_walk_df, sweep_class, indicator_class):
+    df = random_walk_df(2000)
+    df.loc[:99, 'close'] = np.nan
+    df.loc[1000:1009, 'close'] = np.nan
+
+    sweep = assert_sweep_matches(sweep_class, indicator_class, df)
+    assert np.isnan(sweep[:100]).all()
+    assert (~np.isnan(sweep[:, -1])).sum() > 1800
+
+
+@pytest.mark.parametrize('sweep_class, indicator_class', SWEEPS)
+def test_panel_sweep_with_late_asset(kernels, random_walk_panel, sweep_class, indicator_class):
+    panel = random_walk_panel(num_assets=3, num_samples=2000)
+    panel['close'].iloc[:300, 1] = np.nan
+
+    sweep = assert_sweep_matches(sweep_class, indicator_class, panel)
+    assert sweep.shape == (2000, 3, len(PERIODS))
+    assert np.isnan(sweep[:300, 1]).all()
+    assert (~np.isnan(sweep[:, 1, -1])).sum() > 1600
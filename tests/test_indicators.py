@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from finrock.indicators import EMA, ATR, ADX, Stochastic, CCI
+
+
+def wilder(values: list, alpha: float, min_periods: int) -> np.ndarray:
+    """ y = (1 - alpha) * y + alpha * x starting from the first non nan value, nan until min_periods values were seen
+    """
+    result, previous, count = [], None, 0
+    for value in values:
+        if not np.isnan(value):
+            previous = value if previous is None else (1 - alpha) * previous + alpha * value
+            count += 1
+        result.append(previous if count >= min_periods else np.nan)
+    return np.array(result, dtype=np.float64)
+
+
+def true_range(df: pd.DataFrame) -> list:
+    high, low, close = df['high'].tolist(), df['low'].tolist(), df['close'].tolist()
+    return [high[0] - low[0]] + [
+        max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])) for i in range(1, len(df))
+    ]
+
+
+def test_ema(random_walk_df):
+    df = random_walk_df()
+    expected = wilder(df['close'].tolist(), 2 / (20 + 1), 1)
+
+    np.testing.assert_allclose(EMA(data=df, period=20).to_numpy()[:, 0], expected, rtol=1e-9)
+
+
+def test_atr(random_walk_df):
+    df = random_walk_df()
+    expected = wilder(true_range(df), 1 / 14, 14)
+
+    np.testing.assert_allclose(ATR(data=df, period=14).to_numpy()[:, 0], expected, rtol=1e-9)
+
+
+def test_adx(random_walk_df):
+    df = random_walk_df()
+    high, low = df['high'].tolist(), df['low'].tolist()
+    plus_dm, minus_dm = [0.0], [0.0]
+    for i in range(1, len(df)):
+        up_move, down_move = high[i] - high[i - 1], low[i - 1] - low[i]
+        plus_dm.append(up_move if up_move > down_move and up_move > 0 else 0.0)
+        minus_dm.append(down_move if down_move > up_move and down_move > 0 else 0.0)
+
+    atr = wilder(true_range(df), 1 / 14, 14)
+    plus_di = 100 * wilder(plus_dm, 1 / 14, 14) / atr
+    minus_di = 100 * wilder(minus_dm, 1 / 14, 14) / atr
+    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    expected = np.stack([wilder(dx.tolist(), 1 / 14, 14), plus_di, minus_di], axis=-1)
+
+    np.testing.assert_allclose(ADX(data=df, period=14).to_numpy(), expected, rtol=1e-9)
+
+
+def test_stochastic(random_walk_df):
+    df = random_walk_df()
+    stoch_k = np.full(len(df), np.nan)
+    for i in range(13, len(df)):
+        lowest_low, highest_high = df['low'].iloc[i - 13:i + 1].min(), df['high'].iloc[i - 13:i + 1].max()
+        stoch_k[i] = 100 * (df['close'].iloc[i] - lowest_low) / (highest_high - lowest_low)
+    stoch_d = pd.Series(stoch_k).rolling(3).mean().to_numpy()
+
+    np.testing.assert_allclose(Stochastic(data=df, k_period=14, d_period=3).to_numpy(), np.stack([stoch_k, stoch_d], axis=-1), rtol=1e-9)
+
+
+def test_cci(random_walk_df):
+    df = random_walk_df()
+    typical_price = (df['high'] + df['low'] + df['close']) / 3
+    sma = typical_price.rolling(20).mean()
+    deviation = typical_price.rolling(20).apply(lambda window: np.abs(window - window.mean()).mean(), raw=True)
+    expected = ((typical_price - sma) / (0.015 * deviation)).to_numpy()
+
+    np.testing.assert_allclose(CCI(data=df, period=20, constant=0.015).to_numpy()[:, 0], expected, rtol=1e-9)
@@ -0,0 +1,24 @@
+from finrock.state import State, Ledger
+
+
+def make_state(step: int) -> State:
+    return State(timestamp='2020-01-01 00:00:00', open=1.0, high=1.0, low=1.0, close=1.0 + step)
+
+
+def test_states_of_previous_episode_stay_valid():
+    ledger = Ledger(size=10)
+    states = [ledger.append(make_state(step), balance=100.0 + step, assets=step) for step in range(5)]
+    ledger.reset()
+    ledger.append(make_state(0), balance=1.0)
+
+    assert [state.balance for state in states] == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert [state.assets for state in states] == [0, 1, 2, 3, 4]
+
+
+def test_lists_grow_past_initial_capacity():
+    ledger = Ledger(size=10_000_000)
+    assert len(ledger.balance) == Ledger.max_capacity
+
+    states = [ledger.append(make_state(step), balance=float(step)) for step in range(Ledger.max_capacity + 10)]
+    assert len(ledger) == Ledger.max_capacity + 10
+    assert states[0].balance == 0.0 and states[-1].balance == Ledger.max_capacity + 9
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from finrock.indicators import SMA, BolingerBands, RSI, MACD, PSAR, EMA, ATR, ADX, Stochastic, CCI
+
+
+INDICATORS = [
+    lambda df: SMA(data=df, period=20),
+    lambda df: BolingerBands(data=df, period=20, std=2),
+    lambda df: RSI(data=df, period=14),
+    lambda df: MACD(data=df, fast_ma=12, slow_ma=26, histogram=9),
+    lambda df: PSAR(data=df),
+    lambda df: EMA(data=df, period=20),
+    lambda df: ATR(data=df, period=14),
+    lambda df: ADX(data=df, period=14),
+    lambda df: Stochastic(data=df, k_period=14, d_period=3),
+    lambda df: CCI(data=df, period=20),
+]
+
+
+@pytest.mark.parametrize('make_indicator', INDICATORS, ids=['SMA', 'BolingerBands', 'RSI', 'MACD', 'PSAR', 'EMA', 'ATR', 'ADX', 'Stochastic', 'CCI'])
+@pytest.mark.parametrize('split', [0, 1, 25, 100, 399])
+def test_online_updates_match_compute(random_walk_df, make_indicator, split):
+    """ Online indicator continuing after first split rows (cold start for 0) gives the same values as compute()
+    """
+    df = random_walk_df()
+    expected = make_indicator(df).to_numpy()[split:]
+
+    online = make_indicator(df).online(df.iloc[:split] if split else None)
+    streamed = np.array([online.update(candle) for candle in df.iloc[split:].to_dict('records')], dtype=np.float64)
+
+    np.testing.assert_allclose(streamed, expected, rtol=1e-9, atol=1e-9)
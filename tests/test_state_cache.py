@@ -0,0 +1,36 @@
+import pickle
+import threading
+import numpy as np
+
+from finrock.data_feeder import NumpyDataFeeder, StateCache
+
+
+def test_bounded_cache_shared_between_threads(random_walk_df):
+    feeder = NumpyDataFeeder(random_walk_df(2000, timestamps=True), cache_size=64)
+    errors = []
+
+    def read_rows(seed: int):
+        try:
+            for index in np.random.default_rng(seed).integers(0, 2000, 20_000):
+                feeder[int(index)]
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=read_rows, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(feeder._cache) <= 64
+
+
+def test_cache_pickles_with_new_lock():
+    cache = StateCache(max_size=2)
+    cache[0] = None
+    restored = pickle.loads(pickle.dumps(cache))
+
+    assert 0 in restored and restored._lock is not cache._lock
+    restored[1], restored[2] = None, None
+    assert len(restored) == 2 and restored.evictions == 1
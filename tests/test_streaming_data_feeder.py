@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from finrock.data_feeder import StreamingDataFeeder, NumpyDataFeeder, load_indicators
+
+CONFIGS = [{'name': 'RSI', 'period': 14}, {'name': 'PSAR'}, {'name': 'BolingerBands', 'period': 20}]
+
+
+def test_random_starts_match_in_memory_feeder(random_walk_df, tmp_path):
+    path = str(tmp_path / 'prices.csv')
+    random_walk_df(3000, timestamps=True).to_csv(path, index=False)
+    df = pd.read_csv(path)
+    expected = NumpyDataFeeder(df, load_indicators(CONFIGS, df))
+    feeder = StreamingDataFeeder(path, CONFIGS, chunk_size=200, window_size=20)
+
+    for start in [2500, 700, 1900, 50, 2950, 1210]:
+        for idx in range(start - 20, min(start + 40, 3000)):
+            state, expected_state = feeder[idx], expected[idx]
+            assert (state is None) == (expected_state is None)
+            if state is not None:
+                assert state.timestamp == expected_state.timestamp and state.close == expected_state.close
+                np.testing.assert_allclose(state.indicator_values, expected_state.indicator_values, rtol=1e-9)
+
+
+def test_row_before_buffer_restarts_from_checkpoint(random_walk_df, tmp_path):
+    path = str(tmp_path / 'prices.csv')
+    random_walk_df(3000, timestamps=True).to_csv(path, index=False)
+    feeder = StreamingDataFeeder(path, CONFIGS, chunk_size=200, window_size=20)
+
+    feeder[2500]
+    feeder[750]
+    # stream continues from the start of chunk with row 750, not from the beginning of the file
+    assert feeder._buffer_start == 600